@@ -10,9 +10,6 @@ import sys
 import requests
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 from port_tools.clients.port_client import PortClient
 
 # Basic logging setup
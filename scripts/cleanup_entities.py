@@ -7,62 +7,141 @@ Removes entities from the 'documentation' blueprint.
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Generator, Optional
+
 import requests
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
-from port_tools.clients.port_client import PortClient
+from port_tools.clients import json_codec
+from port_tools.clients.port_client import POOL_SIZE, PortClient
+from port_tools.ingest_cache import IngestCache
 
 # Basic logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Concurrent DELETE requests in flight; matches the client's connection pool
+# so every worker reuses a keep-alive connection instead of opening its own.
+MAX_CONCURRENT_DELETES = POOL_SIZE
+
+# Entities fetched per page when listing a blueprint (Port allows up to 1000)
+LIST_PAGE_SIZE = 500
+
+# DELETE responses meaning the entity is gone; 404 means it was already deleted
+DELETED_STATUS_CODES = (200, 204, 404)
+
 class PortEntityCleaner:
     """A utility to clean up entities from a Port blueprint."""
     
     def __init__(self, port_client: PortClient):
         self.port_client = port_client
 
-    def get_all_entities(self, blueprint_id: str) -> list:
-        """Get all entities for a specific blueprint."""
-        url = f"{self.port_client.base_url}/v1/blueprints/{blueprint_id}/entities"
-        try:
-            response = requests.get(url, headers=self.port_client._get_headers())
-            response.raise_for_status()
-            return response.json().get("entities", [])
-        except requests.HTTPError as e:
-            logging.error(f"Failed to get entities for blueprint '{blueprint_id}': {e.response.text}")
-            return []
+    def iter_entity_identifiers(self, blueprint_id: str) -> Generator[str, None, None]:
+        """
+        Yields the identifier of every entity in a blueprint.
+
+        Pages through the search endpoint and asks Port for identifiers only,
+        so large 'content' properties are never downloaded or held in memory.
+
+        :raises requests.RequestException: If a page cannot be fetched; the
+            listing is not silently cut short.
+        """
+        url = f"{self.port_client.base_url}/v1/blueprints/{blueprint_id}/entities/search"
+        # No query matches every entity; Port rejects a query with an empty rules list
+        payload = {
+            "include": ["$identifier"],
+            "limit": LIST_PAGE_SIZE,
+        }
+        while True:
+            try:
+                response = self.port_client.session.post(url, data=json_codec.dumps(payload))
+                response.raise_for_status()
+            except requests.RequestException as e:
+                detail = e.response.text if e.response is not None else e
+                logging.error(f"Failed to get entities for blueprint '{blueprint_id}': {detail}")
+                raise
+
+            data = json_codec.loads(response.content)
+            for entity in data.get("entities", []):
+                if entity.get("identifier"):
+                    yield entity["identifier"]
+
+            next_page = data.get("next")
+            if not next_page:
+                return
+            payload["from"] = next_page
 
     def delete_entity(self, blueprint_id: str, entity_id: str) -> bool:
-        """Deletes a single entity from a blueprint."""
+        """
+        Deletes a single entity from a blueprint.
+
+        The DELETE is sent without checking that the entity still exists: an
+        entity that is already gone answers 404, which counts as success.
+        """
         url = f"{self.port_client.base_url}/v1/blueprints/{blueprint_id}/entities/{entity_id}"
         try:
-            response = requests.delete(url, headers=self.port_client._get_headers())
-            # 404 means it's already gone, which is a success for our purposes
-            if response.status_code == 404:
-                return True
+            response = self.port_client.session.delete(url)
+        except requests.RequestException as e:
+            logging.error(f"Failed to delete entity '{entity_id}': {e}")
+            return False
+
+        if response.status_code in DELETED_STATUS_CODES:
+            return True
+        logging.error(f"Failed to delete entity '{entity_id}': {response.text}")
+        return False
+
+    def delete_all_entities_bulk(self, blueprint_id: str) -> bool:
+        """Deletes every entity of a blueprint with a single call to Port's bulk route."""
+        url = f"{self.port_client.base_url}/v1/blueprints/{blueprint_id}/all-entities"
+        try:
+            response = self.port_client.session.delete(url)
             response.raise_for_status()
             return True
         except requests.HTTPError as e:
-            logging.error(f"Failed to delete entity '{entity_id}': {e.response.text}")
+            logging.warning(
+                f"Bulk delete for blueprint '{blueprint_id}' failed with status "
+                f"{e.response.status_code}: {e.response.text}"
+            )
             return False
+        except requests.RequestException as e:
+            logging.warning(f"Bulk delete for blueprint '{blueprint_id}' failed: {e}")
+            return False
+
+    def delete_all_entities(self, blueprint_id: str) -> Optional[int]:
+        """
+        Deletes all entities for a given blueprint.
+
+        The bulk route is tried first, without listing the entities beforehand;
+        they are only listed when it fails and they must be deleted one by one.
 
-    def delete_all_entities(self, blueprint_id: str) -> int:
-        """Deletes all entities for a given blueprint and returns the count."""
-        logging.info(f"Fetching all entities for blueprint '{blueprint_id}' to begin cleanup...")
-        entities = self.get_all_entities(blueprint_id)
-        if not entities:
+        :return: The number of entities deleted one by one, or None if the bulk
+            route deleted them all (Port does not report how many).
+        :raises requests.RequestException: If the entities cannot all be listed
+            for the one-by-one fallback; nothing is deleted in that case.
+        """
+        logging.info(f"Deleting all entities in blueprint '{blueprint_id}'...")
+        if self.delete_all_entities_bulk(blueprint_id):
+            logging.info("  - Deleted all entities in a single bulk request.")
+            return None
+
+        logging.info("Falling back to deleting entities one at a time...")
+        entity_ids = list(self.iter_entity_identifiers(blueprint_id))
+        if not entity_ids:
             logging.info(f"No entities found for blueprint '{blueprint_id}'. Nothing to delete.")
             return 0
-        
-        logging.info(f"Found {len(entities)} entities. Proceeding with deletion...")
+        logging.info(f"Found {len(entity_ids)} entities. Proceeding with deletion...")
+
+        # Deletes are independent and I/O-bound, so fan them out over a thread
+        # pool sharing the client's session instead of waiting on each round trip.
         deleted_count = 0
-        for entity in entities:
-            entity_id = entity.get("identifier")
-            if entity_id:
-                if self.delete_entity(blueprint_id, entity_id):
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DELETES) as executor:
+            futures = {
+                executor.submit(self.delete_entity, blueprint_id, entity_id): entity_id
+                for entity_id in entity_ids
+            }
+            for future in as_completed(futures):
+                entity_id = futures[future]
+                if future.result():
                     logging.info(f"  - Deleted entity: {entity_id}")
                     deleted_count += 1
                 else:
@@ -99,9 +178,14 @@ def main():
             sys.exit(0)
             
         deleted_count = cleaner.delete_all_entities(blueprint_to_clean)
+        # The deleted documents must be uploaded again on the next ingestion
+        IngestCache.for_port(port_client.base_url, CLIENT_ID).clear()
         
         print("\n🎉 Cleanup Summary 🎉")
-        print(f"Successfully deleted {deleted_count} entities from the '{blueprint_to_clean}' blueprint.")
+        if deleted_count is None:
+            print(f"Successfully deleted all entities from the '{blueprint_to_clean}' blueprint.")
+        else:
+            print(f"Successfully deleted {deleted_count} entities from the '{blueprint_to_clean}' blueprint.")
         
     except Exception as e:
         logging.error(f"An unexpected error occurred during cleanup: {e}", exc_info=True)
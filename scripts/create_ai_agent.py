@@ -4,16 +4,17 @@ Create Port AI Agent Script
 This script creates or updates the Port AI agent based on the `ai-agent-config.json` file.
 """
 
+import logging
 import os
 import sys
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 from port_tools.clients.port_client import PortClient
 from port_tools.ai_agent.manager import AIAgentManager
 
+# The agent manager reports its progress through logging; show it as plain lines
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
 def main():
     """Main function to create the AI agent."""
     print("🚀 Port AI Agent Creator")
@@ -8,9 +8,6 @@ import os
 import sys
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 from port_tools.clients.port_client import PortClient
 from port_tools.search.bot import DocumentationBot
 
@@ -1,19 +1,35 @@
 import logging
 import os
 import sys
+from typing import Optional
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 from port_tools.clients.port_client import PortClient
 from port_tools.parsers.doc_parser import DocParser
 from port_tools.fetchers.local_fetcher import LocalFetcher
+from port_tools.ingest_cache import IngestCache
 from port_tools.ingester import DocumentIngester
 
 # Basic logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+def parse_worker_count(value: Optional[str]) -> int:
+    """
+    Reads the INGEST_N_THREADS setting. Defaults to one parser process per
+    CPU minus one, leaving a core for the main process posting to Port.
+    """
+    default = max(1, (os.cpu_count() or 1) - 1)
+    if value is None or not value.strip():
+        return default
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers < 1:
+        logging.warning(f"INGEST_N_THREADS must be a positive integer, got {value!r}. Using {default}.")
+        return default
+    return workers
+
 def main():
     """Main function to run the local documentation ingestion process."""
     load_dotenv()
@@ -22,6 +38,7 @@ def main():
     CLIENT_ID = os.getenv('PORT_CLIENT_ID')
     CLIENT_SECRET = os.getenv('PORT_CLIENT_SECRET')
     DOCS_PATH = os.getenv('DOCS_PATH', './docs')
+    INGEST_N_THREADS = parse_worker_count(os.getenv('INGEST_N_THREADS'))
     
     if not CLIENT_ID or not CLIENT_SECRET:
         logging.error("PORT_CLIENT_ID and PORT_CLIENT_SECRET must be set.")
@@ -32,8 +49,9 @@ def main():
         logging.info("Initializing Port client and services...")
         port_client = PortClient(CLIENT_ID, CLIENT_SECRET)
         doc_parser = DocParser()
-        local_fetcher = LocalFetcher(parser=doc_parser)
-        ingester = DocumentIngester(port_client=port_client)
+        ingest_cache = IngestCache.for_port(port_client.base_url, CLIENT_ID)
+        local_fetcher = LocalFetcher(parser=doc_parser, max_workers=INGEST_N_THREADS, cache=ingest_cache)
+        ingester = DocumentIngester(port_client=port_client, cache=ingest_cache)
 
         # Setup the blueprint in Port
         logging.info("Setting up documentation blueprint...")
@@ -43,14 +61,8 @@ def main():
 
         # Fetch and ingest documents
         logging.info(f"Starting ingestion from local directory: {DOCS_PATH}")
-        ingested_count = 0
-        failed_count = 0
-
-        for doc_metadata in local_fetcher.fetch_documents(docs_path=DOCS_PATH):
-            if ingester.ingest_document(doc_metadata):
-                ingested_count += 1
-            else:
-                failed_count += 1
+        documents = local_fetcher.fetch_documents(docs_path=DOCS_PATH)
+        ingested_count, failed_count = ingester.ingest_documents(documents)
         
         logging.info("--- Ingestion Summary ---")
         logging.info(f"Successfully ingested: {ingested_count} documents")
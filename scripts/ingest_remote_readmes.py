@@ -4,12 +4,10 @@ import sys
 import toml
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 from port_tools.clients.port_client import PortClient
 from port_tools.parsers.doc_parser import DocParser
 from port_tools.fetchers.git_fetcher import GitFetcher
+from port_tools.ingest_cache import IngestCache
 from port_tools.ingester import DocumentIngester
 
 # Basic logging setup
@@ -55,6 +53,7 @@ def main():
         logging.info("Initializing Port client and services...")
         port_client = PortClient(PORT_CLIENT_ID, PORT_CLIENT_SECRET)
         doc_parser = DocParser()
+        ingest_cache = IngestCache.for_port(port_client.base_url, PORT_CLIENT_ID)
         git_fetcher = GitFetcher(
             parser=doc_parser,
             github_token=GITHUB_TOKEN,
@@ -62,8 +61,9 @@ def main():
             gitlab_token=GITLAB_TOKEN,
             azure_devops_url=AZURE_DEVOPS_URL,
             azure_devops_token=AZURE_DEVOPS_TOKEN,
+            cache=ingest_cache,
         )
-        ingester = DocumentIngester(port_client=port_client)
+        ingester = DocumentIngester(port_client=port_client, cache=ingest_cache)
 
         # Setup the blueprint in Port
         logging.info("Setting up documentation blueprint...")
@@ -73,9 +73,6 @@ def main():
 
         # Fetch and ingest documents
         logging.info("Starting ingestion from remote Git repositories...")
-        ingested_count = 0
-        failed_count = 0
-
         # Create a single generator for all providers
         all_readmes = git_fetcher.fetch_readmes(
             github_orgs=github_orgs,
@@ -83,11 +80,7 @@ def main():
             azure_projects=azure_projects,
         )
 
-        for doc_metadata in all_readmes:
-            if ingester.ingest_document(doc_metadata):
-                ingested_count += 1
-            else:
-                failed_count += 1
+        ingested_count, failed_count = ingester.ingest_documents(all_readmes)
 
         logging.info("--- Ingestion Summary ---")
         logging.info(f"Successfully ingested: {ingested_count} READMEs")
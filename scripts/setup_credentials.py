@@ -5,13 +5,9 @@ Helps you configure your Port API credentials for all scripts.
 """
 
 import os
-import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 # Conditional import for testing
 try:
     from port_tools.clients.port_client import PortClient
@@ -90,7 +86,8 @@ def test_credentials():
         print("❌ Could not import PortClient. Cannot test credentials.")
         return False
         
-    load_dotenv()
+    # Override so a re-test after reconfiguring picks up the newly written values
+    load_dotenv(override=True)
     client_id = os.getenv('PORT_CLIENT_ID')
     client_secret = os.getenv('PORT_CLIENT_SECRET')
     
@@ -99,7 +96,8 @@ def test_credentials():
         return False
     
     try:
-        # Attempt to initialize the client, which triggers authentication
+        # Attempt to initialize the client, which triggers authentication.
+        # Credentials validated earlier in this run reuse their cached token.
         PortClient(client_id, client_secret)
         print("✅ Credentials are valid! Successfully authenticated with Port API.")
         return True
@@ -4,17 +4,36 @@ Test Port AI Agent Script
 This script invokes the AI agent with a series of test prompts to ensure it's responding correctly.
 """
 
+import logging
 import os
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 from port_tools.clients.port_client import PortClient
 from port_tools.ai_agent.manager import AIAgentManager
 
+# The agent manager reports its progress through logging; show it as plain lines
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+# Test prompts in flight at once; kept low to be polite to Port's rate limits.
+# Throttled (429) responses are retried by the client after their Retry-After.
+MAX_CONCURRENT_QUERIES = 3
+
+def format_query_report(position: int, total: int, query_result: dict) -> str:
+    """
+    Builds the report for one test query as a single block, so reports from
+    queries run concurrently do not interleave.
+    """
+    result = query_result["result"] or {}
+    status = result.get('status', 'failed')
+    mark = "✅" if query_result["success"] else "❌"
+    lines = [f"\n[{position}/{total}] Query: '{query_result['query']}'",
+             f"   {mark} Status: {status}"]
+    if result.get('invocationId'):
+        lines.append(f"   - Invocation ID: {result['invocationId']}")
+    return "\n".join(lines)
+
 def run_test_queries(agent_manager: AIAgentManager):
     """Runs a predefined set of test queries against the AI agent."""
     test_queries = [
@@ -29,16 +48,20 @@ def run_test_queries(agent_manager: AIAgentManager):
     print("🧪 Running a series of test queries against the AI agent...")
     print("=" * 60)
 
-    results = []
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n[{i}/{len(test_queries)}] Query: '{query}'")
+    def run_query(query):
         result = agent_manager.invoke(query, wait_for_completion=True)
-        results.append({
+        return {
             "query": query,
             "result": result,
             "success": result is not None and result.get('status') == 'completed'
-        })
-        time.sleep(1)  # Avoid hitting rate limits
+        }
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUERIES) as executor:
+        # map yields in submission order, so each report prints whole and in sequence
+        results = []
+        for i, r in enumerate(executor.map(run_query, test_queries), 1):
+            print(format_query_report(i, len(test_queries), r))
+            results.append(r)
 
     successful_queries = sum(1 for r in results if r['success'])
     print("\n📊 Test Summary:")
@@ -6,17 +6,40 @@ Provides a class to manage the lifecycle and testing of Port AI Agents.
 
 import os
 import json
+import logging
 import time
+from functools import lru_cache
+from pathlib import Path
 from typing import Optional, Dict, Any
 
+import requests
+
+from ..clients import json_codec
 from ..clients.port_client import PortClient
 
+logger = logging.getLogger(__name__)
+
+# Longest pause, in seconds, between polls for an invocation's result
+POLL_MAX_INTERVAL = 5
+
+
+@lru_cache(maxsize=8)
+def _load_agent_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parses an agent configuration file. Results are shared by all managers and
+    keyed on the file's modification time, so edits are picked up on the next call.
+    """
+    return json_codec.loads(Path(path).read_bytes())
+
 
 class AIAgentManager:
     """
     Manages creation, testing, and interaction with Port AI Agents.
     """
 
+    # Invocation statuses (lowercased) after which polling stops
+    FINISHED_STATUSES = ("completed", "failed")
+
     def __init__(self, client: PortClient, agent_config_path: str = 'ai-agent-config.json'):
         """
         Initializes the AI Agent Manager.
@@ -31,13 +54,13 @@ class AIAgentManager:
     def _get_agent_config(self) -> Optional[Dict[str, Any]]:
         """Loads the AI agent configuration from the specified JSON file."""
         try:
-            with open(self.agent_config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime_ns = os.stat(self.agent_config_path).st_mtime_ns
+            return _load_agent_config(self.agent_config_path, mtime_ns)
         except FileNotFoundError:
-            print(f"❌ Error: Agent configuration file not found at '{self.agent_config_path}'")
+            logger.error(f"❌ Error: Agent configuration file not found at '{self.agent_config_path}'")
             return None
         except json.JSONDecodeError:
-            print(f"❌ Error: Invalid JSON in agent configuration file at '{self.agent_config_path}'")
+            logger.error(f"❌ Error: Invalid JSON in agent configuration file at '{self.agent_config_path}'")
             return None
 
     def create_agent(self) -> bool:
@@ -47,14 +70,14 @@ class AIAgentManager:
         Note: The actual API endpoint for creating agents is not yet public.
         This method is a placeholder for the future implementation.
         """
-        print("🤖 Attempting to create or update the AI Documentation Agent...")
+        logger.info("🤖 Attempting to create or update the AI Documentation Agent...")
         config = self._get_agent_config()
         if not config:
             return False
 
         agent_config = config.get('agentConfig', {})
         if not agent_config:
-            print("❌ Error: 'agentConfig' not found in the configuration file.")
+            logger.error("❌ Error: 'agentConfig' not found in the configuration file.")
             return False
 
         # This payload structure is conceptual and based on observed patterns.
@@ -71,17 +94,17 @@ class AIAgentManager:
             "settings": agent_config.get("settings")
         }
 
-        print("📋 Agent configuration prepared:")
-        print(f"   - Name: {agent_payload['name']}")
-        print(f"   - Blueprints: {agent_payload['blueprints']}")
+        logger.info("📋 Agent configuration prepared:")
+        logger.info(f"   - Name: {agent_payload['name']}")
+        logger.info(f"   - Blueprints: {agent_payload['blueprints']}")
 
         # Conceptual API call
         # url = f"{self.base_url}/v1/agents"
         # response = self.client.session.post(url, json=agent_payload)
         
-        print("\n⚠️ Note: The API endpoint for agent creation is not yet publicly available.")
-        print("   This script has prepared the configuration based on the provided JSON file.")
-        print("   Once Port enables the API, this function can be fully implemented.")
+        logger.warning("⚠️ Note: The API endpoint for agent creation is not yet publicly available.")
+        logger.warning("   This script has prepared the configuration based on the provided JSON file.")
+        logger.warning("   Once Port enables the API, this function can be fully implemented.")
 
         # For now, we return True to indicate the process was followed.
         return True
@@ -95,7 +118,7 @@ class AIAgentManager:
         :param max_wait: Maximum seconds to wait for completion.
         :return: The API response dictionary or None on failure.
         """
-        print(f"💬 Invoking AI agent with prompt: '{prompt}'")
+        logger.info(f"💬 Invoking AI agent with prompt: '{prompt}'")
         url = f"{self.base_url}/v1/agent/invoke"
         payload = {
             "prompt": prompt,
@@ -107,37 +130,57 @@ class AIAgentManager:
         }
 
         try:
-            response = self.client.session.post(url, json=payload)
+            response = self.client.session.post(url, data=json_codec.dumps(payload))
             response.raise_for_status()
 
-            result = response.json()
+            result = json_codec.loads(response.content)
             invocation_id = result.get('invocation', {}).get('identifier')
-            print(f"✅ Invocation started successfully. ID: {invocation_id}")
+            logger.info(f"✅ Invocation started successfully. ID: {invocation_id}")
 
             if wait_for_completion and invocation_id:
                 return self._wait_for_result(invocation_id, max_wait)
             return result
 
         except Exception as e:
-            print(f"❌ Error invoking AI agent: {e}")
+            logger.error(f"❌ Error invoking AI agent: {e}")
             if "401" in str(e):
-                 print("   Hint: This may mean the AI Agents feature is not enabled for your account.")
+                logger.warning("   Hint: This may mean the AI Agents feature is not enabled for your account.")
             return None
 
     def _wait_for_result(self, invocation_id: str, max_wait: int) -> Optional[Dict[str, Any]]:
         """
-        Polls for the result of a specific invocation.
+        Polls for the result of a specific invocation until it finishes or
+        max_wait seconds pass.
 
-        Note: The actual API endpoint for checking status is not yet public.
-        This method is a placeholder for the future implementation.
-        """
-        print(f"⏳ Waiting up to {max_wait}s for invocation {invocation_id} to complete...")
-        
-        # This endpoint is conceptual and needs to be verified.
-        # url = f"{self.base_url}/v1/agent/invocations/{invocation_id}"
+        Polls start 0.5s apart and back off exponentially to at most
+        POLL_MAX_INTERVAL seconds, so quick answers are picked up promptly
+        without polling long-running invocations every second.
 
-        print("⚠️ Note: The API endpoint for checking invocation status is not yet publicly available.")
-        print("   This script cannot currently poll for a final result.")
-        
-        # Returning a mock success structure for now
-        return {"status": "completed", "invocationId": invocation_id, "mock_result": "This is a placeholder result."} 
\ No newline at end of file
+        :return: The invocation result with a lowercased 'status', or None on
+            failure or timeout.
+        """
+        logger.info(f"⏳ Waiting up to {max_wait}s for invocation {invocation_id} to complete...")
+        url = f"{self.base_url}/v1/agent/invoke/{invocation_id}"
+        deadline = time.monotonic() + max_wait
+        attempt = 0
+
+        while True:
+            try:
+                response = self.client.session.get(url)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logger.error(f"❌ Error checking invocation {invocation_id}: {e}")
+                return None
+
+            data = json_codec.loads(response.content)
+            result = data.get('result', data)
+            status = str(result.get('status', '')).lower()
+            if status in self.FINISHED_STATUSES:
+                return {**result, "status": status, "invocationId": invocation_id}
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"⚠️ Invocation {invocation_id} did not complete within {max_wait}s (status: {status or 'unknown'}).")
+                return None
+            time.sleep(min(remaining, POLL_MAX_INTERVAL, 0.5 * 1.6 ** attempt))
+            attempt += 1
@@ -1,42 +1,214 @@
 import logging
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, List, Optional, Set
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from port_tools.clients import json_codec, token_cache
 
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections held open per host; sized for the concurrent
+# fan-out done by the cleanup and ingestion scripts.
+POOL_SIZE = 32
+
+# Most entities Port accepts in a single bulk create request
+BULK_ENTITIES_LIMIT = 20
+
+# Once fewer than this fraction of the rate-limit window's requests remain,
+# new requests wait for the window to reset.
+RATE_LIMIT_RESERVE = 0.1
+
+
+def _rate_limit_wait(response: requests.Response) -> float:
+    """Returns how long new requests should hold off after this response, or 0."""
+    headers = response.headers
+    try:
+        retry_after = headers.get("Retry-After")
+        if response.status_code == 429 and retry_after:
+            return float(retry_after)
+        remaining = headers.get("X-RateLimit-Remaining")
+        limit = headers.get("X-RateLimit-Limit")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or limit is None or reset is None:
+            return 0.0
+        if int(remaining) > int(limit) * RATE_LIMIT_RESERVE:
+            return 0.0
+        reset = float(reset)
+    except ValueError:
+        return 0.0
+    # The reset is either an epoch timestamp or a number of seconds
+    return max(0.0, reset - time.time()) if reset > 1e9 else reset
+
+
+class _PortRetry(Retry):
+    """
+    Retry policy for Port API calls. A 429 means Port rejected the request
+    without processing it, so it is retried for every method, including the
+    POSTs used for search and upserts; other statuses are only retried for
+    idempotent methods.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """
+    Connection adapter that paces every thread sharing the session. When Port
+    answers with a 429 or reports its quota nearly spent, requests wait out
+    the Retry-After delay or the window reset instead of drawing more 429s.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pause_lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def send(self, request, **kwargs):
+        delay = self._paused_until - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        response = super().send(request, **kwargs)
+        wait = _rate_limit_wait(response)
+        if wait:
+            logger.info(f"Port API rate limit reached. Pausing requests for {wait:.0f}s...")
+            with self._pause_lock:
+                self._paused_until = max(self._paused_until, time.time() + wait)
+        return response
+
 
 class PortClient:
     """A client for interacting with the Port API."""
 
     def __init__(self, client_id: str, client_secret: str, base_url: str = "https://api.getport.io"):
         self.base_url = base_url
-        self.session = self._authenticate(client_id, client_secret)
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._refresh_lock = threading.Lock()
+        self._refresh_timer: Optional[threading.Timer] = None
+        # Cleared the first time Port answers the bulk route with 404/405
+        self._bulk_supported = True
+        # Blueprints seen to exist, which can be updated without checking first
+        self._known_blueprints: Set[str] = set()
+        self._auth_url = f"{base_url}/v1/auth/access_token"
+        # Created before authenticating so the token request opens the
+        # connection that the first API call then reuses.
+        self.session = self._create_session()
+        self._authenticate(client_id, client_secret)
+        self._schedule_token_refresh()
+
+    def _authenticate(self, client_id: str, client_secret: str) -> None:
+        """
+        Authenticate with the Port API and install the access token on the session.
+
+        Access tokens are valid for about an hour, so a still-valid token from
+        the shared token cache is reused instead of requesting a new one.
+        """
+        cached = token_cache.load_token(self.base_url, client_id, client_secret)
+        if cached:
+            logger.info("Using cached Port API access token.")
+            access_token, self.token_expires_at = cached
+        else:
+            access_token = self._request_access_token(client_id, client_secret)
+        self.session.headers["Authorization"] = f"Bearer {access_token}"
+
+    def _create_session(self) -> requests.Session:
+        """Returns a pooled, retrying session shared by authentication and all API calls."""
+        session = requests.Session()
+        adapter = _RateLimitedAdapter(
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            max_retries=_PortRetry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Content-Type"] = "application/json"
+        session.hooks["response"].append(self._retry_on_unauthorized)
+        return session
+
+    def refresh_token(self, stale_authorization: Optional[str] = None) -> None:
+        """
+        Requests a new access token and installs it on the session.
+
+        :param stale_authorization: The Authorization header a failed request was
+            sent with. If another thread already replaced it, no new token is requested.
+        """
+        with self._refresh_lock:
+            if stale_authorization and self.session.headers.get("Authorization") != stale_authorization:
+                return
+            access_token = self._request_access_token(self._client_id, self._client_secret)
+            self.session.headers["Authorization"] = f"Bearer {access_token}"
+        self._schedule_token_refresh()
+
+    def _schedule_token_refresh(self) -> None:
+        """Renews the token in the background shortly before it expires."""
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+        delay = max(0.0, self.token_expires_at - time.time() - token_cache.EXPIRY_MARGIN)
+        self._refresh_timer = threading.Timer(delay, self._refresh_in_background)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh_token()
+        except requests.RequestException:
+            # Already logged; the next 401 response triggers another attempt.
+            pass
+
+    def _retry_on_unauthorized(self, response: requests.Response, *args, **kwargs) -> requests.Response:
+        """Response hook that refreshes an expired token and replays the request once."""
+        if response.status_code != 401 or getattr(response.request, "is_auth_retry", False):
+            return response
+        if response.request.url == self._auth_url:
+            # Rejected credentials; requesting another token would only recurse
+            return response
+
+        logger.info("Port API rejected the access token. Refreshing and retrying...")
+        self.refresh_token(stale_authorization=response.request.headers.get("Authorization"))
+        response.close()
+
+        retry = response.request.copy()
+        retry.headers["Authorization"] = self.session.headers["Authorization"]
+        retry.is_auth_retry = True
+        return self.session.send(retry, **kwargs)
 
-    def _authenticate(self, client_id: str, client_secret: str) -> requests.Session:
-        """Authenticate with the Port API and return an authenticated session."""
+    def _request_access_token(self, client_id: str, client_secret: str) -> str:
+        """Exchange the client credentials for a new access token."""
         logger.info("Authenticating with Port API...")
-        auth_url = f"{self.base_url}/v1/auth/access_token"
         auth_data = {"clientId": client_id, "clientSecret": client_secret}
         
         try:
-            response = requests.post(auth_url, json=auth_data)
+            # A None header is dropped, so an expired token is not sent along
+            response = self.session.post(self._auth_url, json=auth_data, headers={"Authorization": None})
             response.raise_for_status()
-            access_token = response.json().get("accessToken")
-            
-            session = requests.Session()
-            session.headers.update({
-                "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json"
-            })
+            data = response.json()
+            access_token = data.get("accessToken")
+            self.token_expires_at = token_cache.store_token(
+                self.base_url, client_id, client_secret, access_token, data.get("expiresIn", 3600)
+            )
             logger.info("Authentication successful.")
-            return session
+            return access_token
         except requests.RequestException as e:
             logger.error(f"Failed to authenticate with Port API: {e}", exc_info=True)
             raise
 
     def create_blueprint(self, blueprint_data: Dict) -> bool:
-        """Creates or updates a blueprint in Port."""
+        """
+        Creates or updates a blueprint in Port. Blueprints this client has
+        already created or updated are updated without an existence check.
+        """
         identifier = blueprint_data.get("identifier")
         if not identifier:
             logger.error("Blueprint data must contain an 'identifier'.")
@@ -45,21 +217,31 @@ class PortClient:
         url = f"{self.base_url}/v1/blueprints/{identifier}"
         
         try:
+            if identifier in self._known_blueprints:
+                response = self.session.put(url, data=json_codec.dumps(blueprint_data))
+                if response.status_code != 404:
+                    response.raise_for_status()
+                    logger.info(f"Blueprint '{identifier}' updated successfully.")
+                    return True
+                # Deleted since it was last seen; create it again
+                self._known_blueprints.discard(identifier)
+
             # Check if the blueprint exists
             get_response = self.session.get(url)
 
             if get_response.status_code == 200:
                 # Update existing blueprint
                 logger.info(f"Blueprint '{identifier}' already exists. Updating...")
-                response = self.session.put(url, json=blueprint_data)
+                response = self.session.put(url, data=json_codec.dumps(blueprint_data))
             else:
                 # Create new blueprint
                 logger.info(f"Blueprint '{identifier}' not found. Creating...")
                 # The base URL for creation is different
                 create_url = f"{self.base_url}/v1/blueprints"
-                response = self.session.post(create_url, json=blueprint_data)
+                response = self.session.post(create_url, data=json_codec.dumps(blueprint_data))
 
             response.raise_for_status()
+            self._known_blueprints.add(identifier)
             logger.info(f"Blueprint '{identifier}' created/updated successfully.")
             return True
 
@@ -76,7 +258,13 @@ class PortClient:
         logger.info(f"Creating/updating entity '{identifier}' in blueprint '{blueprint_id}'...")
         
         try:
-            response = self.session.post(url, json=entity_data, params=params)
+            body = json_codec.dumps(entity_data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Failed to encode entity '{identifier}' for blueprint '{blueprint_id}': {e}")
+            return False
+
+        try:
+            response = self.session.post(url, data=body, params=params)
             response.raise_for_status()
             logger.info(f"Entity '{identifier}' created/updated successfully in blueprint '{blueprint_id}'.")
             return True
@@ -88,19 +276,82 @@ class PortClient:
                 f"Response Body: {error_details}"
             )
             return False
+        except requests.RequestException as e:
+            logger.error(f"Failed to create/update entity '{identifier}' in blueprint '{blueprint_id}': {e}")
+            return False
+
+    def create_entities_bulk(self, blueprint_id: str, entities: List[Dict]) -> List[bool]:
+        """
+        Creates or updates up to BULK_ENTITIES_LIMIT entities in one request.
+
+        Falls back to one request per entity if the bulk route is unavailable.
+
+        :return: Whether each entity succeeded, in the order given.
+        """
+        if not self._bulk_supported:
+            return [self.create_entity(blueprint_id, entity) for entity in entities]
+
+        url = f"{self.base_url}/v1/blueprints/{blueprint_id}/entities/bulk"
+        params = {"upsert": "true", "merge": "true"}
+        
+        logger.info(f"Creating/updating {len(entities)} entities in blueprint '{blueprint_id}'...")
+        
+        try:
+            body = json_codec.dumps({"entities": entities})
+        except (TypeError, ValueError) as e:
+            logger.error(f"Failed to encode entities for blueprint '{blueprint_id}': {e}")
+            return [False] * len(entities)
+
+        try:
+            response = self.session.post(url, data=body, params=params)
+        except requests.RequestException as e:
+            logger.error(f"Failed to bulk create entities in blueprint '{blueprint_id}': {e}")
+            return [False] * len(entities)
+
+        if response.status_code in (404, 405):
+            logger.info("Bulk entity route is not available. Creating entities one at a time...")
+            self._bulk_supported = False
+            return [self.create_entity(blueprint_id, entity) for entity in entities]
+
+        if not response.ok:
+            logger.error(
+                f"Failed to bulk create entities in blueprint '{blueprint_id}': {response.status_code}\n"
+                f"Response Body: {response.text}"
+            )
+            return [False] * len(entities)
+
+        # A 207 reports per-entity failures by their index in the request
+        results = [True] * len(entities)
+        positions = {entity.get("identifier"): i for i, entity in enumerate(entities)}
+        try:
+            for error in json_codec.loads(response.content).get("errors", []):
+                index = error.get("index")
+                if not isinstance(index, int) or not 0 <= index < len(entities):
+                    index = positions[error.get("identifier")]
+                results[index] = False
+                logger.error(
+                    f"Failed to create/update entity '{error.get('identifier')}' in blueprint "
+                    f"'{blueprint_id}': {error.get('message')}"
+                )
+        except (ValueError, KeyError, AttributeError) as e:
+            # Without a readable report there is no telling which entities were stored
+            logger.error(f"Unreadable bulk response for blueprint '{blueprint_id}': {e!r}")
+            return [False] * len(entities)
+        logger.info(f"{results.count(True)} of {len(entities)} entities created/updated in blueprint '{blueprint_id}'.")
+        return results
 
     def search_entities(self, blueprint_id: str, query: Optional[Dict] = None, limit: int = 5) -> Dict:
         """Searches for entities within a given blueprint."""
         url = f"{self.base_url}/v1/blueprints/{blueprint_id}/entities/search"
-        payload = {
-            "query": query if query else {"combinator": "and", "rules": []},
-            "limit": limit
-        }
+        payload = {"limit": limit}
+        # Without a query every entity matches; Port rejects an empty rules list
+        if query:
+            payload["query"] = query
         
         try:
-            response = self.session.post(url, json=payload)
+            response = self.session.post(url, data=json_codec.dumps(payload))
             response.raise_for_status()
-            return response.json()
+            return json_codec.loads(response.content)
         except requests.RequestException as e:
             logger.error(f"Failed to search entities in blueprint '{blueprint_id}': {e}", exc_info=True)
             raise
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # fcntl is not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = Path(os.getenv("PORT_TOKEN_CACHE", Path.home() / ".port_token_cache.json"))
+
+# Tokens closer than this (in seconds) to their expiry are treated as expired.
+EXPIRY_MARGIN = 60
+
+# Per-process copy of the cache so repeated clients skip the file entirely.
+_memory_cache: Dict[str, Dict] = {}
+
+
+def _cache_key(base_url: str, client_id: str, client_secret: str) -> str:
+    # A digest of the secret is part of the key so that a wrong or rotated
+    # secret never gets served a token issued for the old one.
+    secret_digest = hashlib.sha256(client_secret.encode('utf-8')).hexdigest()[:16]
+    return f"{base_url}|{client_id}|{secret_digest}"
+
+
+def _lock(f, exclusive: bool) -> None:
+    """Take an advisory lock on the cache file; released when the file is closed."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def _read_entries(f) -> Dict:
+    f.seek(0)
+    raw = f.read()
+    try:
+        return json.loads(raw) if raw else {}
+    except json.JSONDecodeError:
+        logger.debug(f"Ignoring corrupt token cache at {CACHE_FILE}.")
+        return {}
+
+
+def load_token(base_url: str, client_id: str, client_secret: str) -> Optional[Tuple[str, float]]:
+    """
+    Returns a cached (access_token, expires_at) pair for the given client,
+    or None if there is no token that is still comfortably valid.
+    """
+    key = _cache_key(base_url, client_id, client_secret)
+    entry = _memory_cache.get(key)
+    if entry is None:
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                _lock(f, exclusive=False)
+                entry = _read_entries(f).get(key)
+        except OSError:
+            return None
+
+    if not entry or entry.get("expiresAt", 0) - time.time() <= EXPIRY_MARGIN:
+        return None
+
+    _memory_cache[key] = entry
+    return entry["accessToken"], entry["expiresAt"]
+
+
+def store_token(base_url: str, client_id: str, client_secret: str,
+                access_token: str, expires_in: float) -> float:
+    """Caches a freshly issued access token and returns its absolute expiry time."""
+    key = _cache_key(base_url, client_id, client_secret)
+    entry = {"accessToken": access_token, "expiresAt": time.time() + expires_in}
+    _memory_cache[key] = entry
+
+    try:
+        fd = os.open(CACHE_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'r+', encoding='utf-8') as f:
+            _lock(f, exclusive=True)
+            entries = _read_entries(f)
+            entries[key] = entry
+            f.seek(0)
+            f.truncate()
+            json.dump(entries, f)
+        os.chmod(CACHE_FILE, 0o600)
+    except OSError as e:
+        logger.warning(f"Could not write Port token cache to {CACHE_FILE}: {e}")
+
+    return entry["expiresAt"]
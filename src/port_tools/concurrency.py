@@ -0,0 +1,87 @@
+import logging
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Generator, Iterable, Iterator, List, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Marks the end of one stream in merge_streams' queue
+_STREAM_DONE = object()
+
+# How often (in seconds) a producer blocked on a full merge queue checks
+# whether the consumer has gone away
+MERGE_PUT_TIMEOUT = 0.5
+
+
+def bounded_map(executor: Executor, fn: Callable[[T], R], items: Iterable[T], window: int) -> Iterator[R]:
+    """
+    Like executor.map, but keeps at most `window` calls submitted at a time.
+
+    executor.map drains its whole input before returning the first result; this
+    pulls items lazily instead, so streaming sources are consumed as results are
+    used and memory stays bounded. Results are yielded in input order.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def merge_streams(streams: List[Generator[T, None, None]], buffer_size: int) -> Generator[T, None, None]:
+    """
+    Drains each stream on its own thread and yields their items as they
+    arrive. The bounded queue keeps fast streams from running far ahead of
+    the consumer. If the consumer stops early, the producer threads close
+    their streams and exit instead of blocking on the full queue.
+    """
+    if len(streams) == 1:
+        yield from streams[0]
+        return
+
+    merged: queue.Queue = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                merged.put(item, timeout=MERGE_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def drain(stream):
+        try:
+            for item in stream:
+                if not put(item):
+                    break
+        except Exception as e:
+            logger.error(f"A merged stream stopped early: {e}", exc_info=True)
+        finally:
+            try:
+                # Runs the stream's cleanup, such as shutting down its thread pool
+                stream.close()
+            finally:
+                put(_STREAM_DONE)
+
+    for stream in streams:
+        threading.Thread(target=drain, args=(stream,), daemon=True).start()
+
+    try:
+        remaining = len(streams)
+        while remaining:
+            item = merged.get()
+            if item is _STREAM_DONE:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        stopped.set()
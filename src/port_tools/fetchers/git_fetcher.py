@@ -1,30 +1,135 @@
 import base64
 import logging
-from typing import Dict, Generator, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Generator, Iterable, List, Optional
 from datetime import datetime, timezone
-from dateutil import parser as date_parser
+from email.utils import parsedate_to_datetime
 
+import requests
 from github import Github, GithubException
 from gitlab import Gitlab, GitlabError
 from azure.devops.connection import Connection
 from msrest.authentication import BasicAuthentication
 
+from port_tools.concurrency import bounded_map, merge_streams
+from port_tools.ingest_cache import IngestCache
 from port_tools.parsers.doc_parser import DocParser, DocMetadata
 
 logger = logging.getLogger(__name__)
 
+# READMEs downloaded at once per provider; kept modest to stay clear of the
+# providers' secondary rate limits on concurrent requests
+FETCH_CONCURRENCY = 10
+
+# GitHub requests kept in reserve; below this many, fetching pauses until the
+# rate limit window resets instead of failing part-way through an org
+RATE_LIMIT_RESERVE = 5
+
+# Fetched READMEs buffered between the provider threads and the consumer
+MERGE_BUFFER_SIZE = 50
+
 class GitFetcher:
     """Fetches README files from various Git providers."""
 
     def __init__(self, parser: DocParser, github_token: Optional[str] = None, 
                  gitlab_url: Optional[str] = None, gitlab_token: Optional[str] = None,
-                 azure_devops_url: Optional[str] = None, azure_devops_token: Optional[str] = None):
+                 azure_devops_url: Optional[str] = None, azure_devops_token: Optional[str] = None,
+                 cache: Optional[IngestCache] = None):
         self.parser = parser
         self.github_token = github_token
         self.gitlab_url = gitlab_url
         self.gitlab_token = gitlab_token
         self.azure_devops_url = azure_devops_url
         self.azure_devops_token = azure_devops_token
+        # When set, GitHub READMEs are requested conditionally on their ETag
+        self.cache = cache
+
+    @staticmethod
+    def _fetch_concurrently(fetch_one: Callable[..., Optional[DocMetadata]],
+                            repos: Iterable) -> Generator[DocMetadata, None, None]:
+        """
+        Runs fetch_one over repos on a thread pool, so README downloads overlap
+        instead of waiting on each provider round trip in turn.
+        """
+        with ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY) as executor:
+            # Repositories are pulled from the paginator as downloads finish
+            for doc_metadata in bounded_map(executor, fetch_one, repos, 2 * FETCH_CONCURRENCY):
+                if doc_metadata is not None:
+                    yield doc_metadata
+
+    @staticmethod
+    def _respect_rate_limit(response: requests.Response) -> bool:
+        """
+        Sleeps until GitHub's rate limit resets if the response shows the
+        quota is nearly used up.
+
+        :return: True if it waited.
+        """
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None or int(remaining) >= RATE_LIMIT_RESERVE:
+            return False
+
+        wait = max(0.0, int(reset) - time.time()) + 1
+        logger.info(f"GitHub rate limit nearly exhausted ({remaining} left). Waiting {wait:.0f}s for it to reset...")
+        time.sleep(wait)
+        return True
+
+    def _fetch_github_readme(self, session: requests.Session, repo) -> Optional[DocMetadata]:
+        """
+        Fetches and parses the README of a single GitHub repository.
+
+        If the README's last fetched version is already in Port, it is requested
+        with If-None-Match; GitHub answers an unchanged README with a 304, which
+        is skipped and does not count against the rate limit.
+        """
+        url = f"{repo.url}/readme"
+        cached = self.cache.get_etag(url) if self.cache else None
+        headers = {}
+        if cached and self.cache.is_current('github', cached[1], cached[2]):
+            headers["If-None-Match"] = cached[0]
+
+        try:
+            response = session.get(url, headers=headers)
+            if self._respect_rate_limit(response) and response.status_code in (403, 429):
+                response = session.get(url, headers=headers)
+            if response.status_code == 304:
+                logger.debug(f"  - README unchanged in {repo.full_name}")
+                return None
+            if response.status_code == 404:
+                logger.debug(f"  - No README found in {repo.full_name}")
+                return None
+            response.raise_for_status()
+
+            readme = response.json()
+            logger.info(f"  - Found README in {repo.full_name}")
+            
+            content = base64.b64decode(readme["content"]).decode('utf-8')
+            
+            # Last-Modified is an RFC 2822 HTTP date; convert it to ISO 8601
+            last_updated_dt = parsedate_to_datetime(response.headers["Last-Modified"])
+            last_updated_iso = last_updated_dt.isoformat()
+            file_path = f"{repo.full_name}/{readme['path']}"
+            
+            doc_metadata = self.parser.parse(
+                content=content,
+                source='github',
+                file_path=file_path,
+                last_updated=last_updated_iso,
+                repo_url=repo.html_url,
+                file_url=readme["html_url"]
+            )
+            if self.cache and response.headers.get("ETag"):
+                self.cache.store_etag(url, response.headers["ETag"], file_path, last_updated_iso)
+            return doc_metadata
+            
+        except requests.RequestException as e:
+            logger.error(f"Error fetching README from {repo.full_name}: {e}")
+        except Exception as e:
+            logger.error(f"An unexpected error occurred for repo {repo.full_name}: {e}")
+        return None
 
     def _fetch_github_readmes(self, orgs: List[str]) -> Generator[DocMetadata, None, None]:
         """Fetches READMEs from GitHub repositories."""
@@ -32,94 +137,117 @@ class GitFetcher:
             return
         
         logger.info("Connecting to GitHub...")
-        g = Github(self.github_token)
+        # List repositories 100 per request (GitHub's maximum) instead of the default 30
+        g = Github(self.github_token, per_page=100)
+        # READMEs are fetched directly so the requests can be made conditional
+        session = requests.Session()
+        session.headers.update({
+            "Authorization": f"Bearer {self.github_token}",
+            "Accept": "application/vnd.github+json",
+        })
         
         for org_name in orgs:
             try:
                 org = g.get_organization(org_name)
                 logger.info(f"Fetching repositories for GitHub organization: {org_name}")
-                for repo in org.get_repos():
-                    try:
-                        readme = repo.get_readme()
-                        logger.info(f"  - Found README in {repo.full_name}")
-                        
-                        content = base64.b64decode(readme.content).decode('utf-8')
-                        
-                        # Convert last_modified string to a datetime object, then to ISO 8601 format
-                        last_updated_dt = date_parser.parse(readme.last_modified)
-                        last_updated_iso = last_updated_dt.isoformat()
-                        
-                        doc_metadata = self.parser.parse(
-                            content=content,
-                            source='github',
-                            file_path=f"{repo.full_name}/{readme.path}",
-                            last_updated=last_updated_iso,
-                            repo_url=repo.html_url,
-                            file_url=readme.html_url
-                        )
-                        yield doc_metadata
-                        
-                    except GithubException as e:
-                        if e.status == 404:
-                            logger.debug(f"  - No README found in {repo.full_name}")
-                        else:
-                            logger.error(f"Error fetching README from {repo.full_name}: {e}")
-                    except Exception as e:
-                        logger.error(f"An unexpected error occurred for repo {repo.full_name}: {e}")
+                yield from self._fetch_concurrently(partial(self._fetch_github_readme, session), org.get_repos())
 
             except GithubException as e:
                 logger.error(f"Error fetching GitHub organization {org_name}: {e}")
             except Exception as e:
                 logger.error(f"An unexpected error occurred for org {org_name}: {e}")
                 
+    def _fetch_gitlab_readme(self, project) -> Optional[DocMetadata]:
+        """Fetches and parses the README of a single GitLab project."""
+        try:
+            # In GitLab API, file paths are relative to the repo root. The raw
+            # route returns the file body itself rather than base64 in JSON.
+            raw = project.files.raw(file_path='README.md', ref=project.default_branch)
+            logger.info(f"  - Found README in {project.path_with_namespace}")
+
+            content = raw.decode('utf-8')
+            
+            # Get the last commit for the file to use as last_updated
+            last_commit = project.commits.list(query_parameters={'path': 'README.md'}, per_page=1, get_all=False)[0]
+            # GitLab provides ISO 8601 directly, so just ensure it's a string
+            last_updated_iso = str(last_commit.created_at)
+            
+            return self.parser.parse(
+                content=content,
+                source='gitlab',
+                file_path=f"{project.path_with_namespace}/README.md",
+                last_updated=last_updated_iso,
+                repo_url=project.web_url,
+                file_url=f"{project.web_url}/-/blob/{project.default_branch}/README.md"
+            )
+
+        except GitlabError as e:
+            if e.response_code == 404:
+                logger.debug(f"  - No README found in {project.path_with_namespace}")
+            else:
+                logger.error(f"Error fetching README from {project.path_with_namespace}: {e}")
+        except Exception as e:
+            logger.error(f"An unexpected error occurred for project {project.path_with_namespace}: {e}")
+        return None
+
     def _fetch_gitlab_readmes(self, groups: List[str]) -> Generator[DocMetadata, None, None]:
         """Fetches READMEs from GitLab projects."""
         if not self.gitlab_url or not self.gitlab_token or not groups:
             return
 
         logger.info(f"Connecting to GitLab at {self.gitlab_url}...")
-        gl = Gitlab(self.gitlab_url, private_token=self.gitlab_token)
+        # List projects 100 per request (GitLab's maximum) instead of the default 20
+        gl = Gitlab(self.gitlab_url, private_token=self.gitlab_token, per_page=100)
 
         for group_name in groups:
             try:
                 group = gl.groups.get(group_name)
                 logger.info(f"Fetching projects for GitLab group: {group.name}")
-                for project in group.projects.list(all=True):
-                    try:
-                        # In GitLab API, file paths are relative to the repo root
-                        readme_file = project.files.get(file_path='README.md', ref=project.default_branch)
-                        logger.info(f"  - Found README in {project.path_with_namespace}")
-                        
-                        content = base64.b64decode(readme_file.content).decode('utf-8')
-                        
-                        # Get the last commit for the file to use as last_updated
-                        last_commit = project.commits.list(get_all=True, query_parameters={'path': 'README.md'})[0]
-                        # GitLab provides ISO 8601 directly, so just ensure it's a string
-                        last_updated_iso = str(last_commit.created_at)
-                        
-                        doc_metadata = self.parser.parse(
-                            content=content,
-                            source='gitlab',
-                            file_path=f"{project.path_with_namespace}/README.md",
-                            last_updated=last_updated_iso,
-                            repo_url=project.web_url,
-                            file_url=f"{project.web_url}/-/blob/{project.default_branch}/README.md"
-                        )
-                        yield doc_metadata
-
-                    except GitlabError as e:
-                        if e.response_code == 404:
-                            logger.debug(f"  - No README found in {project.path_with_namespace}")
-                        else:
-                            logger.error(f"Error fetching README from {project.path_with_namespace}: {e}")
-                    except Exception as e:
-                        logger.error(f"An unexpected error occurred for project {project.path_with_namespace}: {e}")
+                yield from self._fetch_concurrently(self._fetch_gitlab_readme, group.projects.list(iterator=True))
 
             except GitlabError as e:
                 logger.error(f"Error fetching GitLab group {group_name}: {e}")
             except Exception as e:
                 logger.error(f"An unexpected error occurred for group {group_name}: {e}")
 
+    def _fetch_azure_readme(self, git_client, project_name: str, repo) -> Optional[DocMetadata]:
+        """Fetches and parses the README of a single Azure Repos repository."""
+        try:
+            # Default path for README in Azure Repos
+            item = git_client.get_item(
+                repository_id=repo.id,
+                project=project_name,
+                path='/README.md',
+                include_content=True
+            )
+            
+            logger.info(f"  - Found README in {repo.name}")
+            
+            # Azure DevOps API returns content directly
+            content = item.content
+            
+            # Get the latest commit for the file for the last updated date
+            commits = git_client.get_commits(
+                repository_id=repo.id,
+                project=project_name,
+                search_criteria={'itemPath': '/README.md', '$top': 1}
+            )
+            last_updated = commits[0].committer.date.isoformat() if commits else datetime.now(timezone.utc).isoformat()
+            
+            return self.parser.parse(
+                content=content,
+                source='azure_repos',
+                file_path=f"{project_name}/{repo.name}/README.md",
+                last_updated=last_updated,
+                repo_url=repo.web_url,
+                file_url=f"{repo.web_url.replace('/_git/', '/_git/')}?path=%2FREADME.md"
+            )
+            
+        except Exception as e:
+            # The Azure DevOps client often raises generic exceptions for 404s
+            logger.debug(f"  - No README found in {repo.name} or error fetching it: {e}")
+        return None
+
     def _fetch_azure_readmes(self, projects: List[str]) -> Generator[DocMetadata, None, None]:
         """Fetches READMEs from Azure Repos."""
         if not self.azure_devops_url or not self.azure_devops_token or not projects:
@@ -134,42 +262,8 @@ class GitFetcher:
             try:
                 logger.info(f"Fetching repositories for Azure DevOps project: {project_name}")
                 repos = git_client.get_repositories(project_name)
-                for repo in repos:
-                    try:
-                        # Default path for README in Azure Repos
-                        item = git_client.get_item(
-                            repository_id=repo.id,
-                            project=project_name,
-                            path='/README.md',
-                            include_content=True
-                        )
-                        
-                        logger.info(f"  - Found README in {repo.name}")
-                        
-                        # Azure DevOps API returns content directly
-                        content = item.content
-                        
-                        # Get the latest commit for the file for the last updated date
-                        commits = git_client.get_commits(
-                            repository_id=repo.id,
-                            project=project_name,
-                            search_criteria={'itemPath': '/README.md', '$top': 1}
-                        )
-                        last_updated = commits[0].committer.date.isoformat() if commits else datetime.now(timezone.utc).isoformat()
-                        
-                        doc_metadata = self.parser.parse(
-                            content=content,
-                            source='azure_repos',
-                            file_path=f"{project_name}/{repo.name}/README.md",
-                            last_updated=last_updated,
-                            repo_url=repo.web_url,
-                            file_url=f"{repo.web_url.replace('/_git/', '/_git/')}?path=%2FREADME.md"
-                        )
-                        yield doc_metadata
-                        
-                    except Exception as e:
-                        # The Azure DevOps client often raises generic exceptions for 404s
-                        logger.debug(f"  - No README found in {repo.name} or error fetching it: {e}")
+                fetch_one = partial(self._fetch_azure_readme, git_client, project_name)
+                yield from self._fetch_concurrently(fetch_one, repos)
 
             except Exception as e:
                 logger.error(f"Error fetching Azure DevOps project {project_name}: {e}")
@@ -185,13 +279,15 @@ class GitFetcher:
         :param azure_projects: A list of Azure DevOps project names to scan.
         :return: A generator of DocMetadata objects.
         """
+        streams = []
         if github_orgs:
-            yield from self._fetch_github_readmes(github_orgs)
-        
+            streams.append(self._fetch_github_readmes(github_orgs))
         if gitlab_groups:
-            yield from self._fetch_gitlab_readmes(gitlab_groups)
-            
+            streams.append(self._fetch_gitlab_readmes(gitlab_groups))
         if azure_projects:
-            yield from self._fetch_azure_readmes(azure_projects)
+            streams.append(self._fetch_azure_readmes(azure_projects))
+
+        # Providers are independent, so they are walked at the same time
+        yield from merge_streams(streams, MERGE_BUFFER_SIZE)
 
         # Future integrations for Bitbucket, Azure DevOps will be added here 
\ No newline at end of file
@@ -1,18 +1,96 @@
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from itertools import repeat
 from pathlib import Path
-from typing import Generator, List, Optional
+from typing import Generator, List, Optional, Tuple
 
+from port_tools.ingest_cache import IngestCache
 from port_tools.parsers.doc_parser import DocParser, DocMetadata
 
 logger = logging.getLogger(__name__)
 
+# Files handed to each worker process at a time; batching keeps the pickling
+# overhead small compared to the parsing work.
+PARSE_CHUNK_SIZE = 16
+
+# Directories that never hold documentation and are not descended into
+SKIPPED_DIRS = frozenset({'.git', 'node_modules', '.venv', 'venv', '__pycache__'})
+
+
+def _find_files(base_path: Path, file_extensions: List[str]) -> List[Tuple[Path, float]]:
+    """
+    Walks base_path for files with the given extensions, pruning SKIPPED_DIRS
+    so large dependency and VCS trees are never listed.
+
+    :return: (path, modification time) pairs, taken from the directory scan.
+    """
+    suffixes = tuple(ext.lower() for ext in file_extensions)
+    found = []
+    pending = [str(base_path)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIPPED_DIRS:
+                            pending.append(entry.path)
+                    elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                        found.append((Path(entry.path), entry.stat().st_mtime))
+        except OSError as e:
+            logger.warning(f"Skipping unreadable path while scanning for documents: {e}")
+    return found
+
+
+def _format_mtime(mtime: float) -> str:
+    """A modification time as an ISO 8601 string."""
+    return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
+
+
+# The parser each worker process uses, installed once by _init_worker
+_worker_parser: Optional[DocParser] = None
+
+
+def _init_worker(parser: DocParser) -> None:
+    """Hands the fetcher's parser to a worker process once, at pool startup."""
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _parse_local_file(base_path: Path, file_path: Path, last_updated: str) -> Optional[DocMetadata]:
+    """
+    Reads and parses a single file. Lives at module level so it can be
+    pickled and run in a worker process.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Use relative path for a cleaner file_path in the entity
+        relative_path = file_path.relative_to(base_path)
+        
+        return _worker_parser.parse(
+            content=content,
+            source='local',
+            file_path=str(relative_path),
+            last_updated=last_updated
+        )
+    except Exception as e:
+        logger.error(f"Failed to process local file {file_path}: {e}", exc_info=True)
+        return None
+
+
 class LocalFetcher:
     """Fetches documentation from the local file system."""
 
-    def __init__(self, parser: DocParser):
+    def __init__(self, parser: DocParser, max_workers: Optional[int] = None,
+                 cache: Optional[IngestCache] = None):
         self.parser = parser
+        # None lets the pool use one worker per CPU
+        self.max_workers = max_workers
+        # When set, files unchanged since their last upload are not parsed
+        self.cache = cache
 
     def fetch_documents(
         self,
@@ -21,6 +99,7 @@ class LocalFetcher:
     ) -> Generator[DocMetadata, None, None]:
         """
         Scans a directory for documentation files and yields metadata for each.
+        Files are parsed in parallel across worker processes.
 
         :param docs_path: The root directory to scan for documentation.
         :param file_extensions: A list of file extensions to consider.
@@ -33,25 +112,28 @@ class LocalFetcher:
 
         logger.info(f"Scanning for documents in '{base_path}' with extensions {file_extensions}...")
         
-        for file_path in base_path.rglob('*'):
-            if file_path.suffix.lower() in file_extensions and file_path.is_file():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Use relative path for a cleaner file_path in the entity
-                    relative_path = file_path.relative_to(base_path)
-                    
-                    last_updated_ts = os.path.getmtime(file_path)
-                    last_updated_dt = datetime.fromtimestamp(last_updated_ts, tz=timezone.utc)
-                    
-                    doc_metadata = self.parser.parse(
-                        content=content,
-                        source='local',
-                        file_path=str(relative_path),
-                        last_updated=last_updated_dt.isoformat()
-                    )
-                    yield doc_metadata
+        file_paths = []
+        last_updated = []
+        for file_path, mtime in _find_files(base_path, file_extensions):
+            modified = _format_mtime(mtime)
+            if self.cache and self.cache.is_current('local', str(file_path.relative_to(base_path)), modified):
+                continue
+            file_paths.append(file_path)
+            last_updated.append(modified)
 
-                except Exception as e:
-                    logger.error(f"Failed to process local file {file_path}: {e}", exc_info=True)
+        if not file_paths:
+            logger.info("No new or changed documents found.")
+            return
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.parser,)) as executor:
+            results = executor.map(
+                _parse_local_file,
+                repeat(base_path),
+                file_paths,
+                last_updated,
+                chunksize=PARSE_CHUNK_SIZE,
+            )
+            for doc_metadata in results:
+                if doc_metadata is not None:
+                    yield doc_metadata
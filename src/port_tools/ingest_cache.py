@@ -0,0 +1,106 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.getenv("INGEST_CACHE_PATH", ".ingest_cache.db")
+
+
+class IngestCache:
+    """
+    Remembers which version of each document was last uploaded to Port, so
+    repeated ingestion runs can skip documents that have not changed.
+
+    Documents are keyed on (source, file_path) and versioned by their
+    last_updated timestamp. A hash of the uploaded entity is kept as well, so
+    a document whose timestamp moved but whose content did not is not re-sent.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        # Upload results are recorded from the ingester's worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " source TEXT NOT NULL,"
+                " file_path TEXT NOT NULL,"
+                " last_updated TEXT NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " PRIMARY KEY (source, file_path))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS etags ("
+                " url TEXT PRIMARY KEY,"
+                " etag TEXT NOT NULL,"
+                " file_path TEXT NOT NULL,"
+                " last_updated TEXT NOT NULL)"
+            )
+
+    @classmethod
+    def for_port(cls, base_url: str, client_id: str, path: str = DEFAULT_CACHE_PATH) -> "IngestCache":
+        """
+        Opens the cache for one Port organization. Each base URL and client id
+        gets its own database file next to `path`, so documents uploaded to one
+        organization are never taken as current in another.
+        """
+        scope = hashlib.blake2b(f"{base_url}|{client_id}".encode('utf-8'), digest_size=8).hexdigest()
+        root, ext = os.path.splitext(path)
+        return cls(f"{root}-{scope}{ext}")
+
+    def is_current(self, source: str, file_path: str, last_updated: str) -> bool:
+        """Returns True if this exact version of the document was already uploaded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_updated FROM documents WHERE source = ? AND file_path = ?",
+                (source, file_path),
+            ).fetchone()
+        return row is not None and row[0] == last_updated
+
+    def is_unchanged(self, source: str, file_path: str, content_hash: str) -> bool:
+        """Returns True if an entity with exactly this content was already uploaded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM documents WHERE source = ? AND file_path = ?",
+                (source, file_path),
+            ).fetchone()
+        return row is not None and row[0] == content_hash
+
+    def record(self, documents: Iterable[Tuple[str, str, str, str]]) -> None:
+        """Records (source, file_path, last_updated, content_hash) tuples as uploaded."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents (source, file_path, last_updated, content_hash)"
+                " VALUES (?, ?, ?, ?)",
+                documents,
+            )
+
+    def get_etag(self, url: str) -> Optional[Tuple[str, str, str]]:
+        """Returns the (etag, file_path, last_updated) last seen for a URL, if any."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, file_path, last_updated FROM etags WHERE url = ?", (url,)
+            ).fetchone()
+
+    def store_etag(self, url: str, etag: str, file_path: str, last_updated: str) -> None:
+        """Remembers the ETag of a fetched document and the version it identifies."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO etags (url, etag, file_path, last_updated) VALUES (?, ?, ?, ?)",
+                (url, etag, file_path, last_updated),
+            )
+
+    def clear(self) -> None:
+        """Forgets every recorded upload, forcing the next run to ingest everything."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents")
+            self._conn.execute("DELETE FROM etags")
+        logger.info(f"Cleared ingest cache at {self.path}.")
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,19 +1,46 @@
+import hashlib
 import json
 import logging
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-from port_tools.clients.port_client import PortClient
+from port_tools.clients.port_client import BULK_ENTITIES_LIMIT, POOL_SIZE, PortClient
+from port_tools.concurrency import bounded_map
+from port_tools.ingest_cache import IngestCache
 from port_tools.parsers.doc_parser import DocMetadata
 
 logger = logging.getLogger(__name__)
 
+
+def _batched(items: Iterable, size: int) -> Iterator[Tuple]:
+    """Yields successive tuples of at most `size` items."""
+    iterator = iter(items)
+    while batch := tuple(islice(iterator, size)):
+        yield batch
+
+
+def _entity_hash(entity_data: Dict) -> str:
+    """
+    Hashes everything Port stores for an entity except its lastUpdated
+    timestamp, which changes whenever a file is touched. BLAKE2b is used for
+    speed; the hash only detects changes and need not resist forgery.
+    """
+    properties = {k: v for k, v in entity_data["properties"].items() if k != "lastUpdated"}
+    # Frontmatter can hold YAML dates; hash them as the text they upload as
+    encoded = json.dumps([entity_data["title"], properties], sort_keys=True, default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+
 class DocumentIngester:
     """Handles the ingestion of processed documents into Port."""
 
     BLUEPRINT_ID = "documentation"
 
-    def __init__(self, port_client: PortClient):
+    def __init__(self, port_client: PortClient, cache: Optional[IngestCache] = None):
         self.port_client = port_client
+        # When set, unchanged documents are skipped and uploads are recorded
+        self.cache = cache
 
     def _construct_entity_payload(self, doc_metadata: DocMetadata) -> Dict:
         """Constructs the Port entity payload from document metadata."""
@@ -60,6 +87,88 @@ class DocumentIngester:
             logger.error(f"Failed to ingest document {doc_metadata.file_path}: {e}", exc_info=True)
             return False
 
+    def _ingest_batch(self, batch: Tuple[DocMetadata, ...]) -> List[bool]:
+        """
+        Ingests a batch of documents, counting every document in it as failed
+        if an unexpected error occurs, so one bad batch cannot end the run.
+        """
+        try:
+            return self._upload_batch(batch)
+        except Exception as e:
+            logger.error(f"Failed to ingest a batch of {len(batch)} documents: {e}", exc_info=True)
+            return [False] * len(batch)
+
+    def _upload_batch(self, batch: Tuple[DocMetadata, ...]) -> List[bool]:
+        """
+        Ingests a batch of documents with a single bulk request. With a cache,
+        documents whose entity content is already in Port are not sent again.
+        """
+        results = {}
+        to_upload = []
+        for index, doc_metadata in enumerate(batch):
+            try:
+                entity = self._construct_entity_payload(doc_metadata)
+                content_hash = _entity_hash(entity) if self.cache else None
+            except Exception as e:
+                logger.error(f"Failed to ingest document {doc_metadata.file_path}: {e}", exc_info=True)
+                results[index] = False
+                continue
+            key = (doc_metadata.source, doc_metadata.file_path)
+            if content_hash and self.cache.is_unchanged(*key, content_hash):
+                # Only the timestamp moved; remember it so the file is not parsed again
+                self.cache.record([(*key, doc_metadata.last_updated, content_hash)])
+                results[index] = True
+                continue
+            to_upload.append((index, doc_metadata, entity, content_hash))
+
+        if to_upload:
+            uploaded = self.port_client.create_entities_bulk(
+                self.BLUEPRINT_ID, [entity for _, _, entity, _ in to_upload]
+            )
+            for (index, doc_metadata, _, content_hash), ok in zip(to_upload, uploaded):
+                results[index] = ok
+            if self.cache:
+                self.cache.record(
+                    (doc.source, doc.file_path, doc.last_updated, content_hash)
+                    for (_, doc, _, content_hash), ok in zip(to_upload, uploaded) if ok
+                )
+        return [results[index] for index in range(len(batch))]
+
+    def ingest_documents(self, documents: Iterable[DocMetadata],
+                         max_workers: int = POOL_SIZE) -> Tuple[int, int]:
+        """
+        Ingests many documents concurrently, sending them to Port in bulk
+        batches instead of one request per document. Documents the cache
+        reports as already uploaded are skipped and counted as succeeded.
+
+        :param documents: The documents to ingest; consumed as they arrive.
+        :param max_workers: Number of batch requests kept in flight.
+        :return: A (succeeded, failed) count pair.
+        """
+        skipped_count = 0
+
+        def changed_documents() -> Iterator[DocMetadata]:
+            nonlocal skipped_count
+            for doc in documents:
+                if self.cache and self.cache.is_current(doc.source, doc.file_path, doc.last_updated):
+                    skipped_count += 1
+                else:
+                    yield doc
+
+        ingested_count = 0
+        failed_count = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            batches = _batched(changed_documents(), BULK_ENTITIES_LIMIT)
+            # Documents are pulled from the fetcher only as uploads finish
+            for results in bounded_map(executor, self._ingest_batch, batches, 2 * max_workers):
+                succeeded = sum(results)
+                ingested_count += succeeded
+                failed_count += len(results) - succeeded
+
+        if skipped_count:
+            logger.info(f"Skipped {skipped_count} documents unchanged since the last ingestion.")
+        return ingested_count + skipped_count, failed_count
+
     def setup_blueprint(self, blueprint_file: str = "port-docs-blueprint.json") -> bool:
         """
         Creates or updates the documentation blueprint in Port using a
@@ -5,12 +5,46 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import frontmatter
-import markdown
-from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Fenced code blocks, including one left open where the summary head is cut off
+_CODE_FENCE_RE = re.compile(r'```.*?(?:```|$)', re.DOTALL)
+
+# Images and links collapse to their text; the rest of the syntax is dropped
+_MD_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MD_SYNTAX_RE = re.compile(
+    r'^[ \t]*(?:#{1,6}[ \t]+|>[ \t]*|[-*+][ \t]+|\d+\.[ \t]+)'  # headings, quotes, list markers
+    r'|<[^>]+>'                                                  # inline HTML
+    r'|[*`~]+|(?<!\w)_+|_+(?!\w)',                               # emphasis and inline code
+    re.MULTILINE,
+)
+
+# Opening delimiters of python-frontmatter's YAML, TOML and JSON handlers
+_FRONTMATTER_OPENERS = ('---', '+++', '{')
+
+_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+
+# Path keywords mapped to categories, checked in order; the first hit wins
+_PATH_CATEGORIES = (
+    ('api', 'API Reference'),
+    ('reference', 'API Reference'),
+    ('guide', 'Guide'),
+    ('tutorial', 'Guide'),
+    ('example', 'Example'),
+    ('concept', 'Concept'),
+)
+
+_TECH_TERMS = (
+    'api', 'rest', 'graphql', 'webhook', 'python', 'javascript',
+    'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'integration'
+)
+# One pass over the content finds every term. Terms only need to start a
+# word, so variants such as "APIs", "python3" and "RESTful" still count,
+# while words that merely contain one, like "interest", do not.
+_TECH_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _TECH_TERMS)) + r')', re.IGNORECASE)
+
+@dataclass(slots=True)
 class DocMetadata:
     """Standardized metadata extracted from a documentation file."""
     title: str
@@ -33,6 +67,10 @@ class DocParser:
     @staticmethod
     def extract_frontmatter(content: str) -> Tuple[Dict, str]:
         """Extract frontmatter from markdown content."""
+        content = content.strip()
+        # Skip the handler machinery for the many files with no frontmatter
+        if not content.startswith(_FRONTMATTER_OPENERS):
+            return {}, content
         try:
             post = frontmatter.loads(content)
             return post.metadata, post.content
@@ -43,7 +81,7 @@ class DocParser:
     @staticmethod
     def extract_title(content: str, source_path: str) -> str:
         """Extract title from content or filename."""
-        title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        title_match = _H1_RE.search(content)
         if title_match:
             return title_match.group(1).strip()
         return Path(source_path).stem.replace('-', ' ').replace('_', ' ').title()
@@ -51,9 +89,11 @@ class DocParser:
     @staticmethod
     def generate_summary(content: str, max_length: int = 250) -> str:
         """Generate summary from markdown content."""
-        html = markdown.markdown(content)
-        soup = BeautifulSoup(html, 'html.parser')
-        text = soup.get_text().strip()
+        # The summary only ever uses the opening words, so only strip that much
+        head = content[:max_length * 8]
+        text = _CODE_FENCE_RE.sub(' ', head)
+        text = _MD_LINK_RE.sub(r'\1', text)
+        text = _MD_SYNTAX_RE.sub('', text)
         
         summary = ' '.join(text.split()[:50]) # First 50 words
         if len(summary) > max_length:
@@ -64,14 +104,9 @@ class DocParser:
     def categorize_document(source_path: str, content: str) -> str:
         """Categorize document based on path and content."""
         path_lower = source_path.lower()
-        if 'api' in path_lower or 'reference' in path_lower:
-            return 'API Reference'
-        if 'guide' in path_lower or 'tutorial' in path_lower:
-            return 'Guide'
-        if 'example' in path_lower:
-            return 'Example'
-        if 'concept' in path_lower:
-            return 'Concept'
+        for keyword, category in _PATH_CATEGORIES:
+            if keyword in path_lower:
+                return category
         return 'Documentation'
 
     @staticmethod
@@ -86,14 +121,7 @@ class DocParser:
         except Exception:
             pass
 
-        tech_terms = [
-            'api', 'rest', 'graphql', 'webhook', 'python', 'javascript', 
-            'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'integration'
-        ]
-        content_lower = content.lower()
-        for term in tech_terms:
-            if term in content_lower:
-                tags.add(term)
+        tags.update(match.lower() for match in _TECH_RE.findall(content))
         
         return sorted(list(tags))
 
@@ -1,80 +1,178 @@
+import copy
+import heapq
 import logging
 import os
-from typing import List, Dict
+import re
+import time
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
 
-import openai
 import requests
 
+from port_tools.clients import json_codec
 from port_tools.clients.port_client import PortClient
 
 logger = logging.getLogger(__name__)
 
+# Words of four or more characters that are worth searching for on their own
+_KEYWORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9_-]{3,}")
+# Common words that would otherwise match almost every document
+_STOPWORDS = frozenset([
+    'about', 'after', 'also', 'could', 'does', 'explain', 'find', 'from', 'have',
+    'into', 'need', 'should', 'show', 'tell', 'that', 'their', 'there', 'these',
+    'they', 'this', 'using', 'want', 'what', 'when', 'where', 'which', 'while',
+    'will', 'with', 'would', 'your',
+])
+
 class DocumentSearcher:
     """Enhanced document search implementation."""
+
+    # Short, high-signal fields searched first; the full content is only
+    # scanned when they match too few documents
+    SEARCH_FIELDS = ("$title", "summary", "category")
+    DEEP_SEARCH_FIELDS = SEARCH_FIELDS + ("content",)
+    # Only these fields are returned; the large 'content' property is never downloaded
+    RESULT_FIELDS = ["$identifier", "$title", "summary", "category", "tags"]
+    # Matches fetched for client-side ranking. Port returns OR-ed matches in
+    # no particular order, so a page only as large as the final result list
+    # could be filled by keyword-only hits before a full-phrase match.
+    CANDIDATE_LIMIT = 200
+    CACHE_MAX_SIZE = 512
+    CACHE_TTL_SECONDS = 300
     
     def __init__(self, port_client: PortClient):
         self.port_client = port_client
+        # LRU-ordered map of normalized search key -> (stored_at, result)
+        self._cache: "OrderedDict[Tuple, Tuple[float, Dict]]" = OrderedDict()
+
+    def clear_cache(self) -> None:
+        """Drop all cached search results, e.g. after entities were changed."""
+        self._cache.clear()
+
+    def _get_cached(self, key: Tuple) -> Optional[Dict]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        # Hand out a copy so callers cannot mutate the cached entities
+        return copy.deepcopy(result)
+
+    def _store_cached(self, key: Tuple, result: Dict) -> None:
+        self._cache[key] = (time.monotonic(), copy.deepcopy(result))
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.CACHE_MAX_SIZE:
+            self._cache.popitem(last=False)
     
-    def search_entities(self, search_term: str, limit: int = 25) -> Dict:
-        """Search for documentation entities using Port's API."""
+    def search_entities(self, search_term: str, limit: int = 25, keywords: Sequence[str] = (),
+                        deep: bool = False) -> Dict:
+        """
+        Search for documentation entities using Port's API.
+
+        Entities matching the search term or any of the optional keywords are
+        returned by a single request, as all terms are OR-ed together.
+        Successful results are cached for a few minutes per normalized query.
+
+        :param deep: Also search the full document content, which is far larger
+            than the title, summary and category and so much slower for Port to scan.
+        """
+        cache_key = (search_term.lower().strip(), tuple(keyword.lower() for keyword in keywords), limit, deep)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
         url = f"{self.port_client.base_url}/v1/blueprints/documentation/entities/search"
         
         payload = {
             "query": {
                 "combinator": "or",
                 "rules": [
-                    {"property": "$title", "operator": "contains", "value": search_term},
-                    {"property": "content", "operator": "contains", "value": search_term},
-                    {"property": "summary", "operator": "contains", "value": search_term},
-                    {"property": "category", "operator": "contains", "value": search_term}
+                    {"property": field, "operator": "contains", "value": term}
+                    for term in (search_term, *keywords)
+                    for field in (self.DEEP_SEARCH_FIELDS if deep else self.SEARCH_FIELDS)
                 ]
             },
+            "include": self.RESULT_FIELDS,
             "limit": limit
         }
         
         try:
-            response = requests.post(url, json=payload, headers=self.port_client._get_headers())
-            response.raise_for_status()
-            data = response.json()
-            return {
-                'ok': True,
-                'entities': data.get('entities', []),
-            }
-        except requests.HTTPError as e:
-            logger.error(f"HTTP error during Port search for '{search_term}': {e.response.status_code} - {e.response.text}")
-            return {'ok': False, 'error': str(e)}
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during Port search: {e}", exc_info=True)
+            response = self.port_client.session.post(url, data=json_codec.dumps(payload))
+            # Rate limits are retried by the session, so a failure here is final
+            if not response.ok:
+                logger.error(
+                    f"HTTP error during Port search for '{search_term}': "
+                    f"{response.status_code} - {response.text[:200]}"
+                )
+                return {'ok': False, 'error': f"HTTP {response.status_code}"}
+            data = json_codec.loads(response.content)
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Port search for '{search_term}' failed: {e}")
             return {'ok': False, 'error': str(e)}
 
+        result = {
+            'ok': True,
+            'entities': data.get('entities', []),
+        }
+        self._store_cached(cache_key, result)
+        return result
+
     def multi_strategy_search(self, query: str, max_results: int = 10) -> List[Dict]:
-        """Perform search using multiple strategies to find the best results."""
-        all_results = []
-        
+        """
+        Search for the full query and its individual keywords in one request,
+        then rank the matches by how many of those terms they contain. Document
+        content is only searched when fewer than max_results titles, summaries
+        or categories match.
+        """
+        # Collapsing whitespace lets repeats of a query typed with different
+        # spacing share one cached search
+        query = " ".join(query.split())
         logger.info(f"Searching for: '{query}'...")
-        results = self.search_entities(query)
         
-        if results['ok']:
-            all_results.extend(results['entities'][:max_results // 2])
+        query_lower = query.lower()
+        keywords = [
+            word for word in dict.fromkeys(_KEYWORD_RE.findall(query_lower))
+            if word not in _STOPWORDS and word != query_lower
+        ]
+        results = self.search_entities(query, limit=self.CANDIDATE_LIMIT, keywords=keywords)
+        if results['ok'] and len(results['entities']) < max_results:
+            logger.info("Too few title or summary matches. Searching document content as well...")
+            # The deep search covers the shallow fields too, so it replaces their results
+            deep_results = self.search_entities(query, limit=self.CANDIDATE_LIMIT, keywords=keywords, deep=True)
+            if deep_results['ok']:
+                results = deep_results
+        if not results['ok']:
+            return []
         
-        keywords = query.split()
-        if len(keywords) > 1:
-            for keyword in keywords:
-                if len(keyword) > 3:
-                    keyword_results = self.search_entities(keyword)
-                    if keyword_results['ok']:
-                        all_results.extend(keyword_results['entities'][:max_results // 4])
+        entities = results['entities']
+        # nlargest() keeps only the top results instead of sorting them all, and
+        # like sorted() it is stable, so equal scores keep Port's ordering
+        ranked = heapq.nlargest(
+            max_results,
+            entities,
+            key=lambda entity: self._match_score(entity, query, keywords),
+        )
         
-        seen_identifiers = set()
-        unique_results = []
-        for result in all_results:
-            identifier = result.get('identifier', '')
-            if identifier not in seen_identifiers:
-                seen_identifiers.add(identifier)
-                unique_results.append(result)
+        logger.info(f"Found {len(entities)} results after multi-strategy search.")
+        return ranked
+
+    @staticmethod
+    def _match_score(entity: Dict, query: str, keywords: Sequence[str]) -> int:
+        """Score an entity by the search terms found in its title, summary and category."""
+        properties = entity.get('properties', {})
+        text = " ".join(
+            str(value) for value in
+            (entity.get('title'), properties.get('summary'), properties.get('category'))
+            if value
+        ).lower()
         
-        logger.info(f"Found {len(unique_results)} unique results after multi-strategy search.")
-        return unique_results[:max_results]
+        # A full-query match outranks any combination of keyword matches
+        score = len(keywords) + 1 if query.lower() in text else 0
+        return score + sum(1 for keyword in keywords if keyword.lower() in text)
 
 
 class DocumentationBot:
@@ -82,13 +180,23 @@ class DocumentationBot:
     
     def __init__(self, port_client: PortClient):
         self.searcher = DocumentSearcher(port_client)
-        self.openai_client = None
-        if os.getenv('OPENAI_API_KEY'):
-            try:
-                self.openai_client = openai.OpenAI()
-                logger.info("OpenAI client initialized.")
-            except Exception as e:
-                logger.warning(f"Failed to initialize OpenAI client: {e}")
+
+    @cached_property
+    def openai_client(self):
+        """
+        The OpenAI client, or None without an API key. Built on first use, as
+        the SDK is slow to import and set up and plain searches never need it.
+        """
+        if not os.getenv('OPENAI_API_KEY'):
+            return None
+        try:
+            import openai
+            client = openai.OpenAI()
+            logger.info("OpenAI client initialized.")
+            return client
+        except Exception as e:
+            logger.warning(f"Failed to initialize OpenAI client: {e}")
+            return None
 
     def search_and_respond(self, query: str) -> str:
         """Search for relevant documentation and formulate a response."""
@@ -103,21 +211,25 @@ class DocumentationBot:
 
     def _build_response_from_results(self, query: str, results: List[Dict]) -> str:
         """Build a comprehensive text response from search results."""
-        response = f"Based on your query '{query}', here are the most relevant documents I found:\n\n"
+        parts = [f"Based on your query '{query}', here are the most relevant documents I found:\n\n"]
         
-        for i, result in enumerate(results[:5], 1):
+        head = results[:5]
+        for i, result in enumerate(head, 1):
             title = result.get('title', 'Untitled')
             properties = result.get('properties', {})
             summary = properties.get('summary', 'No summary available.')
             category = properties.get('category', 'General')
+            if len(summary) > 250:
+                summary = summary[:250] + '...'
             
-            response += f"{i}. **{title}** (Category: {category})\n"
-            response += f"   *Summary:* {summary[:250]}{'...' if len(summary) > 250 else ''}\n\n"
+            parts.append(f"{i}. **{title}** (Category: {category})\n")
+            parts.append(f"   *Summary:* {summary}\n\n")
         
-        if len(results) > 5:
-            response += f"...and {len(results) - 5} more results were found.\n"
+        remainder = len(results) - len(head)
+        if remainder > 0:
+            parts.append(f"...and {remainder} more results were found.\n")
         
-        return response
+        return "".join(parts)
 
     def _no_results_response(self, query: str) -> str:
         """Generate a helpful response when no results are found."""
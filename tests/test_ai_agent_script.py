@@ -0,0 +1,21 @@
+from test_ai_agent import format_query_report
+
+
+def test_query_report_is_one_block_naming_the_query():
+    report = format_query_report(2, 6, {
+        "query": "How do I get started?",
+        "result": {"status": "completed", "invocationId": "inv-1"},
+        "success": True,
+    })
+
+    lines = report.strip().splitlines()
+    assert lines[0] == "[2/6] Query: 'How do I get started?'"
+    assert "completed" in lines[1]
+    assert "inv-1" in lines[2]
+
+
+def test_query_report_for_a_failed_invocation():
+    report = format_query_report(1, 6, {"query": "Hi", "result": None, "success": False})
+
+    assert "Query: 'Hi'" in report
+    assert "failed" in report
@@ -0,0 +1,98 @@
+import pytest
+import requests
+
+from cleanup_entities import PortEntityCleaner
+from port_tools.clients import json_codec
+
+
+class _Response:
+    def __init__(self, body=None, status_code=200):
+        self.content = json_codec.dumps(body or {})
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    """Serves search pages in order; an exception in place of a page is raised."""
+
+    def __init__(self, pages=(), bulk_error=None):
+        self.pages = list(pages)
+        self.bulk_error = bulk_error
+        self.bodies = []
+        self.deleted = []
+
+    def post(self, url, data):
+        self.bodies.append(json_codec.loads(data))
+        page = self.pages.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        return _Response(page)
+
+    def delete(self, url):
+        if url.endswith("/all-entities") and self.bulk_error:
+            raise self.bulk_error
+        self.deleted.append(url)
+        return _Response()
+
+
+class _Client:
+    base_url = "https://api.getport.io"
+
+    def __init__(self, session):
+        self.session = session
+
+
+def test_iter_entity_identifiers_sends_no_empty_rules():
+    session = _Session([
+        {"entities": [{"identifier": "a"}, {"identifier": "b"}], "next": "cursor"},
+        {"entities": [{"identifier": "c"}]},
+    ])
+    cleaner = PortEntityCleaner(_Client(session))
+
+    assert list(cleaner.iter_entity_identifiers("documentation")) == ["a", "b", "c"]
+
+    # Port's search schema requires at least one rule, so no query is sent at all
+    assert all("query" not in body for body in session.bodies)
+    assert session.bodies[0]["include"] == ["$identifier"]
+    assert session.bodies[1]["from"] == "cursor"
+
+
+def test_bulk_delete_does_not_list_entities_first():
+    session = _Session()
+    cleaner = PortEntityCleaner(_Client(session))
+
+    assert cleaner.delete_all_entities("documentation") is None
+
+    assert session.deleted == ["https://api.getport.io/v1/blueprints/documentation/all-entities"]
+    assert session.bodies == []
+
+
+def test_connection_error_on_bulk_delete_falls_back_to_one_by_one():
+    session = _Session(
+        [{"entities": [{"identifier": "a"}, {"identifier": "b"}]}],
+        bulk_error=requests.ConnectionError("connection reset"),
+    )
+    cleaner = PortEntityCleaner(_Client(session))
+
+    assert cleaner.delete_all_entities("documentation") == 2
+    assert sorted(session.deleted) == [
+        "https://api.getport.io/v1/blueprints/documentation/entities/a",
+        "https://api.getport.io/v1/blueprints/documentation/entities/b",
+    ]
+
+
+def test_listing_failure_mid_way_deletes_nothing():
+    session = _Session(
+        [
+            {"entities": [{"identifier": "a"}], "next": "cursor"},
+            requests.ConnectionError("connection reset"),
+        ],
+        bulk_error=requests.ConnectionError("connection reset"),
+    )
+    cleaner = PortEntityCleaner(_Client(session))
+
+    with pytest.raises(requests.ConnectionError):
+        cleaner.delete_all_entities("documentation")
+    assert session.deleted == []
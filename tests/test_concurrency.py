@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from port_tools.concurrency import bounded_map, merge_streams
+
+
+def _stream(name, count, closed=None):
+    try:
+        for i in range(count):
+            yield (name, i)
+    finally:
+        if closed is not None:
+            closed.append(name)
+
+
+def test_merge_streams_drains_every_stream():
+    merged = list(merge_streams([_stream('a', 100), _stream('b', 120)], buffer_size=5))
+
+    assert sorted(merged) == sorted([('a', i) for i in range(100)] + [('b', i) for i in range(120)])
+
+
+def test_abandoned_merge_stops_producers():
+    closed = []
+    streams = [_stream('a', 10**6, closed), _stream('b', 10**6, closed)]
+    threads_before = threading.active_count()
+
+    merged = merge_streams(streams, buffer_size=5)
+    for _ in range(3):
+        next(merged)
+    merged.close()
+
+    deadline = time.monotonic() + 5
+    while (len(closed) < 2 or threading.active_count() > threads_before) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert sorted(closed) == ['a', 'b']
+    assert threading.active_count() == threads_before
+
+
+def test_failing_producer_still_ends_the_merge():
+    def failing():
+        yield ('bad', 0)
+        raise RuntimeError("provider went away")
+
+    merged = list(merge_streams([failing(), _stream('good', 50)], buffer_size=5))
+
+    assert ('bad', 0) in merged
+    assert sorted(item for item in merged if item[0] == 'good') == [('good', i) for i in range(50)]
+
+
+def test_bounded_map_keeps_order_and_limits_pulls():
+    pulled = []
+
+    def items():
+        for i in range(20):
+            pulled.append(i)
+            yield i
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = bounded_map(executor, lambda x: x * 2, items(), window=3)
+        first = next(results)
+        # Only the window's worth of items has been taken from the source
+        assert first == 0 and len(pulled) == 3
+        assert [first, *results] == [i * 2 for i in range(20)]
@@ -1,12 +1,7 @@
-import sys
-import os
 from datetime import datetime, timezone
 
 import pytest
 
-# Add src to the Python path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
 from port_tools.parsers.doc_parser import DocParser, DocMetadata
 
 SAMPLE_CONTENT = """---
@@ -68,3 +63,56 @@ def test_parse_content_no_frontmatter(parser):
     assert metadata.summary.startswith("Just a Header")
     assert "Some text." in metadata.summary
     assert "repo" in metadata.tags # From file path
+
+def test_generate_summary_strips_markdown(parser):
+    content = (
+        "## Setup\n\n"
+        "Install the **CLI** with `pip` and read the [guide](https://example.com/guide).\n\n"
+        "```bash\npip install port-cli\n```\n\n"
+        "- Configure your_client_id\n"
+    )
+
+    summary = parser.generate_summary(content)
+
+    assert summary == (
+        "Setup Install the CLI with pip and read the guide. Configure your_client_id"
+    )
+
+def test_extract_tags_ignores_terms_inside_words(parser):
+    content = "Call our REST APIs from Python; see the integrations page. Interest rates apply."
+
+    tags = parser.extract_tags('docs/setup.md', content)
+
+    assert tags == ['api', 'docs', 'integration', 'python', 'rest']
+
+def test_extract_tags_matches_term_variants(parser):
+    content = "A RESTful service for python3, packaged as Docker-compose files and AWS-hosted webhooks."
+
+    tags = parser.extract_tags('setup.md', content)
+
+    assert tags == ['aws', 'docker', 'python', 'rest', 'webhook']
+
+def test_extract_frontmatter_without_block(parser):
+    metadata, content = parser.extract_frontmatter("\n# Title\n\nBody text.\n")
+
+    assert metadata == {}
+    assert content == "# Title\n\nBody text."
+
+def test_extract_frontmatter_reads_toml_block(parser):
+    pytest.importorskip("toml")
+    content = '+++\ntitle = "Deploy Guide"\ncategory = "Guide"\n+++\n\n# Deploying\n'
+
+    metadata, body = parser.extract_frontmatter(content)
+
+    assert metadata == {"title": "Deploy Guide", "category": "Guide"}
+    assert body == "# Deploying"
+
+def test_extract_frontmatter_hands_toml_block_to_frontmatter(parser, monkeypatch):
+    import frontmatter
+
+    seen = []
+    monkeypatch.setattr(frontmatter, "loads", lambda text: seen.append(text) or frontmatter.Post("", title="T"))
+
+    metadata, _ = parser.extract_frontmatter('+++\ntitle = "T"\n+++\nBody')
+
+    assert seen and metadata == {"title": "T"}
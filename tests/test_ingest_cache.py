@@ -0,0 +1,52 @@
+from port_tools.ingest_cache import IngestCache
+
+def test_is_current_tracks_recorded_version(tmp_path):
+    cache = IngestCache(str(tmp_path / "cache.db"))
+
+    assert not cache.is_current('local', 'guides/setup.md', '2024-01-01T00:00:00+00:00')
+
+    cache.record([('local', 'guides/setup.md', '2024-01-01T00:00:00+00:00', 'h1')])
+
+    assert cache.is_current('local', 'guides/setup.md', '2024-01-01T00:00:00+00:00')
+    assert not cache.is_current('local', 'guides/setup.md', '2024-02-01T00:00:00+00:00')
+    assert not cache.is_current('github', 'guides/setup.md', '2024-01-01T00:00:00+00:00')
+
+def test_is_unchanged_compares_content_hash(tmp_path):
+    cache = IngestCache(str(tmp_path / "cache.db"))
+    cache.record([('local', 'a.md', 'v1', 'h1')])
+
+    assert cache.is_unchanged('local', 'a.md', 'h1')
+    assert not cache.is_unchanged('local', 'a.md', 'h2')
+    assert not cache.is_unchanged('local', 'b.md', 'h1')
+
+def test_clear_forgets_everything(tmp_path):
+    cache = IngestCache(str(tmp_path / "cache.db"))
+    cache.record([('local', 'a.md', 'v1', 'h1')])
+
+    cache.clear()
+
+    assert not cache.is_current('local', 'a.md', 'v1')
+
+def test_store_etag_replaces_previous(tmp_path):
+    cache = IngestCache(str(tmp_path / "cache.db"))
+    url = "https://api.github.com/repos/org/repo/readme"
+
+    cache.store_etag(url, '"v1"', 'org/repo/README.md', 't1')
+    cache.store_etag(url, '"v2"', 'org/repo/README.md', 't2')
+
+    assert cache.get_etag(url) == ('"v2"', 'org/repo/README.md', 't2')
+    cache.clear()
+    assert cache.get_etag(url) is None
+
+def test_for_port_separates_organizations(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = IngestCache.for_port("https://api.getport.io", "client-a", path)
+    cache.record([('local', 'a.md', 'v1', 'h1')])
+
+    same_org = IngestCache.for_port("https://api.getport.io", "client-a", path)
+    other_client = IngestCache.for_port("https://api.getport.io", "client-b", path)
+    other_region = IngestCache.for_port("https://api.us.getport.io", "client-a", path)
+
+    assert same_org.is_current('local', 'a.md', 'v1')
+    assert not other_client.is_current('local', 'a.md', 'v1')
+    assert not other_region.is_current('local', 'a.md', 'v1')
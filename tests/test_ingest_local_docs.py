@@ -0,0 +1,31 @@
+import logging
+
+import pytest
+
+from ingest_local_docs import parse_worker_count
+
+
+@pytest.fixture
+def cpus(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+
+
+def test_unset_worker_count_leaves_a_core_free(cpus):
+    assert parse_worker_count(None) == 7
+    assert parse_worker_count("") == 7
+
+
+def test_worker_count_is_read_from_the_setting(cpus):
+    assert parse_worker_count("3") == 3
+
+
+@pytest.mark.parametrize("value", ["four", "-2", "0"])
+def test_invalid_worker_count_falls_back_with_a_warning(cpus, value, caplog):
+    with caplog.at_level(logging.WARNING):
+        assert parse_worker_count(value) == 7
+    assert "INGEST_N_THREADS" in caplog.text
+
+
+def test_single_cpu_still_gets_a_worker(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    assert parse_worker_count(None) == 1
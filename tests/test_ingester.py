@@ -0,0 +1,46 @@
+import datetime
+
+from port_tools.ingest_cache import IngestCache
+from port_tools.ingester import DocumentIngester
+from port_tools.parsers.doc_parser import DocParser
+
+
+class _FakePortClient:
+    def __init__(self):
+        self.uploaded = []
+
+    def create_entities_bulk(self, blueprint_id, entities):
+        self.uploaded.extend(entities)
+        return [True] * len(entities)
+
+
+def test_frontmatter_dates_do_not_abort_ingestion(tmp_path):
+    # YAML loads an unquoted date as a datetime.date, which JSON cannot encode
+    dated = DocParser.parse(
+        content="---\ntitle: 2024-01-01\n---\n# Release notes\n\nWhat changed.",
+        source='local', file_path='notes/2024.md', last_updated='v1',
+    )
+    assert isinstance(dated.title, datetime.date)
+    plain = DocParser.parse(
+        content="# Setup\n\nInstall the tools.",
+        source='local', file_path='setup.md', last_updated='v1',
+    )
+    client = _FakePortClient()
+    ingester = DocumentIngester(client, cache=IngestCache(str(tmp_path / "cache.db")))
+
+    assert ingester.ingest_documents([dated, plain]) == (2, 0)
+    assert len(client.uploaded) == 2
+
+
+class _BrokenPortClient:
+    def create_entities_bulk(self, blueprint_id, entities):
+        raise RuntimeError("unexpected")
+
+
+def test_failing_batch_is_counted_without_ending_the_run():
+    docs = [
+        DocParser.parse(content=f"# Doc {i}", source='local', file_path=f'{i}.md', last_updated='v1')
+        for i in range(3)
+    ]
+
+    assert DocumentIngester(_BrokenPortClient()).ingest_documents(docs) == (0, 3)
@@ -0,0 +1,32 @@
+import datetime
+
+import pytest
+
+from port_tools.clients import json_codec
+from port_tools.clients.port_client import PortClient
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    return json_codec
+
+
+def test_dates_encode_as_iso_strings(codec):
+    value = {"day": datetime.date(2024, 1, 1), "at": datetime.datetime(2024, 1, 1, 12, 30)}
+
+    assert codec.loads(codec.dumps(value)) == {"day": "2024-01-01", "at": "2024-01-01T12:30:00"}
+
+
+def test_bulk_create_fails_batch_on_unencodable_entity(codec):
+    client = PortClient.__new__(PortClient)
+    client.base_url = "https://api.getport.io"
+    client._bulk_supported = True
+
+    entities = [{"identifier": "a"}, {"identifier": "b", "properties": {"bad": object()}}]
+
+    # Encoding fails before any request is sent, so no session is needed
+    assert client.create_entities_bulk("documentation", entities) == [False, False]
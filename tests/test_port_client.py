@@ -0,0 +1,156 @@
+import pytest
+import requests
+
+from port_tools.clients import json_codec, port_client, token_cache
+from port_tools.clients.port_client import PortClient
+
+
+class _Response:
+    def __init__(self, status_code=200, content=b"{}"):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8", "replace")
+        self.ok = status_code < 400
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+class _Session:
+    """Answers each POST with the next queued response, or raises it."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def post(self, url, data=None, params=None):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _client(session) -> PortClient:
+    client = PortClient.__new__(PortClient)
+    client.base_url = "https://api.getport.io"
+    client._bulk_supported = True
+    client.session = session
+    return client
+
+
+ENTITIES = [{"identifier": "a"}, {"identifier": "b"}]
+
+
+def test_bulk_fallback_counts_connection_errors_as_failures():
+    client = _client(_Session(
+        _Response(404),
+        _Response(200),
+        requests.ConnectionError("connection reset"),
+    ))
+
+    assert client.create_entities_bulk("documentation", ENTITIES) == [True, False]
+
+
+def test_bulk_malformed_207_body_fails_the_batch():
+    client = _client(_Session(_Response(207, b"<html>Bad gateway</html>")))
+
+    assert client.create_entities_bulk("documentation", ENTITIES) == [False, False]
+
+
+def test_bulk_207_errors_without_index_match_by_identifier():
+    body = b'{"errors": [{"identifier": "b", "message": "invalid"}]}'
+    client = _client(_Session(_Response(207, body)))
+
+    assert client.create_entities_bulk("documentation", ENTITIES) == [True, False]
+
+
+def test_bulk_207_error_for_unknown_entity_fails_the_batch():
+    body = b'{"errors": [{"message": "invalid"}]}'
+    client = _client(_Session(_Response(207, body)))
+
+    assert client.create_entities_bulk("documentation", ENTITIES) == [False, False]
+
+
+class _StubPort(requests.adapters.BaseAdapter):
+    """
+    Stands in for the HTTP transport. Each access token request issues a new
+    token; API requests are answered by the statuses queued in `api_statuses`.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.tokens_issued = 0
+        self.api_statuses = []
+        self.api_authorizations = []
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response._content_consumed = True
+        if request.url.endswith("/v1/auth/access_token"):
+            self.tokens_issued += 1
+            response.status_code = 200
+            response._content = json_codec.dumps({"accessToken": f"T{self.tokens_issued}", "expiresIn": 3600})
+        else:
+            self.api_authorizations.append(request.headers.get("Authorization"))
+            response.status_code = self.api_statuses.pop(0)
+            response._content = b"{}"
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stub_port(tmp_path, monkeypatch):
+    monkeypatch.setattr(token_cache, "CACHE_FILE", tmp_path / "tokens.json")
+    monkeypatch.setattr(token_cache, "_memory_cache", {})
+    adapter = _StubPort()
+    monkeypatch.setattr(port_client, "_RateLimitedAdapter", lambda **kwargs: adapter)
+    client = PortClient("id", "secret")
+    yield client, adapter
+    client._refresh_timer.cancel()
+
+
+def test_unauthorized_request_is_replayed_once_with_new_token(stub_port):
+    client, port = stub_port
+    port.api_statuses = [401, 200]
+
+    response = client.session.get(f"{client.base_url}/v1/blueprints/documentation")
+
+    assert response.status_code == 200
+    assert port.tokens_issued == 2
+    assert port.api_authorizations == ["Bearer T1", "Bearer T2"]
+    assert client.session.headers["Authorization"] == "Bearer T2"
+
+
+def test_second_unauthorized_response_is_returned_without_looping(stub_port):
+    client, port = stub_port
+    port.api_statuses = [401, 401]
+
+    response = client.session.get(f"{client.base_url}/v1/blueprints/documentation")
+
+    assert response.status_code == 401
+    assert port.tokens_issued == 2
+    assert len(port.api_authorizations) == 2
+
+
+def test_refresh_is_skipped_when_another_thread_already_replaced_the_token(stub_port):
+    client, port = stub_port
+
+    client.refresh_token(stale_authorization="Bearer an-older-token")
+
+    assert port.tokens_issued == 1
+    assert client.session.headers["Authorization"] == "Bearer T1"
+
+
+def test_refresh_replaces_the_scheduled_background_refresh(stub_port):
+    client, port = stub_port
+    scheduled = client._refresh_timer
+
+    client.refresh_token()
+
+    assert port.tokens_issued == 2
+    assert scheduled.finished.is_set()
+    assert client._refresh_timer is not scheduled and client._refresh_timer.is_alive()
@@ -0,0 +1,98 @@
+from port_tools.clients import json_codec
+from port_tools.search.bot import DocumentSearcher
+
+
+class _Response:
+    ok = True
+    status_code = 200
+
+    def __init__(self, body):
+        self.content = json_codec.dumps(body)
+
+
+class _PortSearch:
+    """Emulates Port's search route: OR-ed 'contains' rules, cut to the limit."""
+
+    def __init__(self, entities):
+        self.entities = entities
+        self.payloads = []
+
+    def post(self, url, data):
+        payload = json_codec.loads(data)
+        self.payloads.append(payload)
+        matches = [
+            entity for entity in self.entities
+            if any(self._contains(entity, rule) for rule in payload["query"]["rules"])
+        ]
+        return _Response({"ok": True, "entities": matches[:payload["limit"]]})
+
+    @staticmethod
+    def _contains(entity, rule):
+        if rule["property"] == "$title":
+            value = entity.get("title")
+        else:
+            value = entity.get("properties", {}).get(rule["property"])
+        return bool(value) and rule["value"].lower() in str(value).lower()
+
+
+class _Client:
+    base_url = "https://api.getport.io"
+
+    def __init__(self, session):
+        self.session = session
+
+
+def _doc(identifier, title, summary="", content=""):
+    return {
+        "identifier": identifier,
+        "title": title,
+        "properties": {"summary": summary, "category": "Guide", "content": content},
+    }
+
+
+def test_full_phrase_match_beats_keyword_only_hits():
+    keyword_hits = [_doc(f"kw-{i}", f"Deploy notes {i}") for i in range(30)]
+    phrase_match = _doc("phrase", "Deploy to Kubernetes", summary="How to deploy to kubernetes clusters.")
+    searcher = DocumentSearcher(_Client(_PortSearch(keyword_hits + [phrase_match])))
+
+    results = searcher.multi_strategy_search("deploy to kubernetes", max_results=5)
+
+    assert len(results) == 5
+    assert results[0]["identifier"] == "phrase"
+
+
+def test_match_score_ranks_phrase_above_keywords():
+    keywords = ["deploy", "kubernetes"]
+    phrase = _doc("p", "Deploy to Kubernetes")
+    both = _doc("b", "Kubernetes", summary="deploy")
+    one = _doc("o", "Deploy")
+
+    scores = [DocumentSearcher._match_score(entity, "deploy to kubernetes", keywords)
+              for entity in (phrase, both, one)]
+
+    assert scores == [5, 2, 1]
+
+
+def _searched_fields(payload):
+    return {rule["property"] for rule in payload["query"]["rules"]}
+
+
+def test_content_is_not_searched_when_enough_shallow_matches():
+    docs = [_doc(f"d{i}", f"Webhook setup {i}", content="webhook payloads") for i in range(5)]
+    port = _PortSearch(docs)
+
+    results = DocumentSearcher(_Client(port)).multi_strategy_search("webhook setup", max_results=5)
+
+    assert len(results) == 5
+    assert [("content" in _searched_fields(p)) for p in port.payloads] == [False]
+
+
+def test_content_is_searched_when_too_few_shallow_matches():
+    title_match = _doc("title", "Webhook setup")
+    content_only = _doc("body", "Event delivery", content="Retries for webhook setup failures.")
+    port = _PortSearch([title_match, content_only])
+
+    results = DocumentSearcher(_Client(port)).multi_strategy_search("webhook setup", max_results=5)
+
+    assert [r["identifier"] for r in results] == ["title", "body"]
+    assert [("content" in _searched_fields(p)) for p in port.payloads] == [False, True]
@@ -0,0 +1,56 @@
+import os
+import stat
+
+import pytest
+
+from port_tools.clients import token_cache
+
+BASE_URL = "https://api.getport.io"
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "port_token_cache.json"
+    monkeypatch.setattr(token_cache, "CACHE_FILE", path)
+    monkeypatch.setattr(token_cache, "_memory_cache", {})
+    return path
+
+
+def _forget_in_memory(monkeypatch):
+    """Simulates a new process, which only has the file to go on."""
+    monkeypatch.setattr(token_cache, "_memory_cache", {})
+
+
+def test_valid_token_is_reused_from_file(cache_file, monkeypatch):
+    expires_at = token_cache.store_token(BASE_URL, "id", "secret", "token-1", 3600)
+    _forget_in_memory(monkeypatch)
+
+    assert token_cache.load_token(BASE_URL, "id", "secret") == ("token-1", expires_at)
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+
+
+def test_token_is_not_served_for_another_secret(cache_file):
+    token_cache.store_token(BASE_URL, "id", "secret", "token-1", 3600)
+
+    assert token_cache.load_token(BASE_URL, "id", "rotated-secret") is None
+
+
+def test_token_close_to_expiry_is_ignored(cache_file, monkeypatch):
+    token_cache.store_token(BASE_URL, "id", "secret", "token-1", token_cache.EXPIRY_MARGIN - 1)
+    _forget_in_memory(monkeypatch)
+
+    assert token_cache.load_token(BASE_URL, "id", "secret") is None
+
+
+def test_corrupt_cache_file_is_a_miss(cache_file):
+    cache_file.write_text("{not json")
+
+    assert token_cache.load_token(BASE_URL, "id", "secret") is None
+
+    # The next token overwrites the corrupt file
+    token_cache.store_token(BASE_URL, "id", "secret", "token-2", 3600)
+    assert token_cache.load_token(BASE_URL, "id", "secret")[0] == "token-2"
+
+
+def test_missing_cache_file_is_a_miss(cache_file):
+    assert token_cache.load_token(BASE_URL, "id", "secret") is None